@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 
 from .protocol import DatabaseClient
 
@@ -18,6 +19,8 @@ logger = logging.getLogger(__name__)
 
 # Module-level singleton — created once at startup
 _client: DatabaseClient | None = None
+# Serializes first-time construction so concurrent callers never build two clients (and two pools)
+_client_lock = threading.Lock()
 
 
 def get_db_client() -> DatabaseClient:
@@ -25,21 +28,30 @@ def get_db_client() -> DatabaseClient:
     Returns the active DatabaseClient singleton.
 
     Reads DB_PROVIDER on first call and initialises the matching adapter.
-    Subsequent calls return the cached instance.
+    Subsequent calls return the cached instance without taking the lock.
 
     Raises:
         ValueError: on missing or invalid configuration (fail-fast on startup).
     """
     global _client
-    if _client is not None:
+    client = _client
+    if client is not None:
+        return client
+
+    with _client_lock:
+        if _client is None:
+            _client = _build_client()
         return _client
 
+
+def _build_client() -> DatabaseClient:
+    """Build the adapter selected by DB_PROVIDER."""
     provider = os.getenv("DB_PROVIDER", "supabase").lower().strip()
 
     if provider == "supabase":
-        _client = _build_supabase_client()
+        client = _build_supabase_client()
     elif provider == "postgres":
-        _client = _build_postgres_client()
+        client = _build_postgres_client()
     else:
         raise ValueError(
             f"DB_PROVIDER='{provider}' is not supported. "
@@ -47,7 +59,7 @@ def get_db_client() -> DatabaseClient:
         )
 
     logger.info("DatabaseClient initialised (provider=%s)", provider)
-    return _client
+    return client
 
 
 def _build_supabase_client() -> DatabaseClient:
@@ -90,8 +102,13 @@ def _build_postgres_client() -> DatabaseClient:
 
     min_conn = int(os.getenv("POSTGRES_POOL_MIN", "1"))
     max_conn = int(os.getenv("POSTGRES_POOL_MAX", "10"))
+    # Prepared statements break behind transaction-mode poolers (pgBouncer, the
+    # Supabase pooler on port 6543), so they stay off unless configured
+    statement_cache_size = int(os.getenv("POSTGRES_STATEMENT_CACHE_SIZE", "0"))
 
-    return PostgresDatabaseClient(dsn, min_conn=min_conn, max_conn=max_conn)
+    return PostgresDatabaseClient(
+        dsn, min_conn=min_conn, max_conn=max_conn, statement_cache_size=statement_cache_size
+    )
 
 
 def reset_db_client() -> None:
@@ -100,4 +117,5 @@ def reset_db_client() -> None:
     Not intended for production use.
     """
     global _client
-    _client = None
+    with _client_lock:
+        _client = None
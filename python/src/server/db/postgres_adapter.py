@@ -6,16 +6,34 @@ Implements the same fluent query builder API as supabase-py so all existing
 service code works without modification.
 
 Active when DB_PROVIDER=postgres + POSTGRES_DSN is set.
+
+Driver: psycopg2 (text protocol, no pipeline mode). Round-trips are kept
+down with server-side prepared statements, execute_values batching and
+COPY FROM STDIN for bulk loads rather than psycopg 3's pipeline/binary
+modes, which would require replacing the pool, adapters, COPY and
+execute_values paths as a whole.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import io
 import logging
 import re
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
 from enum import Enum, auto
 from typing import Any
 
+import orjson
 import psycopg2
+import psycopg2.errors
 import psycopg2.extras
 import psycopg2.pool
 
@@ -44,66 +62,566 @@ class _Filter:
         self.value = value
 
 
+def _json_dumps(obj: Any) -> str:
+    """Serialize to JSON text with orjson (non-str dict keys allowed, as with json.dumps)."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _to_json(v: Any) -> psycopg2.extras.Json:
+    """Wrap a value as a JSON/JSONB parameter serialized with orjson."""
+    return psycopg2.extras.Json(v, dumps=_json_dumps)
+
+
 def _adapt_value(v: Any) -> Any:
     """Convert Python objects to psycopg2-compatible types."""
-    if isinstance(v, dict) or isinstance(v, list):
-        return psycopg2.extras.Json(v)
+    if type(v) is str:
+        return v
+    if isinstance(v, (dict, list)):
+        return _to_json(v)
     return v
 
 
+# Rows per INSERT statement sent by psycopg2.extras.execute_values
+_INSERT_PAGE_SIZE = 1000
+
+# Minimum batch size for streaming returning="minimal" inserts through COPY
+# (text-format COPY already beats execute_values at ~10 embedding-sized rows)
+_COPY_MIN_ROWS = 10
+
+# Rows pulled per fetchmany() call when streaming RPC results
+_FETCH_SIZE = 1000
+
+# Seconds a statement waits for a pool connection before failing
+_CHECKOUT_TIMEOUT = 30.0
+
 _IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
 
+@functools.lru_cache(maxsize=1024)
 def _quote_identifier(identifier: str) -> str:
-    """Safely quote a SQL identifier (column/table name)."""
+    """Safely quote a SQL identifier (column/table name); memoized per name."""
     if not _IDENT_RE.match(identifier):
         raise ValueError(f"Invalid SQL identifier: {identifier!r}")
     return f'"{identifier}"'
 
 
-def _build_where(filters: list[_Filter]) -> tuple[str, list[Any]]:
-    """Build WHERE clause and parameters list from filters."""
-    if not filters:
-        return "", []
-    clauses: list[str] = []
+def _quote_columns(columns: str) -> str:
+    """Quote a comma-separated column list ("*" passes through)."""
+    if columns == "*":
+        return "*"
+    return ", ".join(_quote_identifier(col.strip()) for col in columns.split(","))
+
+
+# PostgREST select item: [alias:]column[->key|->>key]... (keys are names or array indexes)
+_SELECT_ITEM_RE = re.compile(
+    r"^(?:([A-Za-z_][A-Za-z0-9_]*):)?([A-Za-z_][A-Za-z0-9_]*)((?:->>?(?:[A-Za-z_][A-Za-z0-9_]*|\d+))*)$"
+)
+_JSON_PATH_RE = re.compile(r"(->>?)([A-Za-z_][A-Za-z0-9_]*|\d+)")
+
+
+def _select_item(item: str) -> str:
+    """
+    Render one PostgREST select item as SQL.
+
+    JSON paths keep PostgREST's naming: "metadata->knowledge_type" yields a
+    column named knowledge_type unless an alias ("kind:metadata->knowledge_type")
+    is given. Every segment is validated, so nothing unquoted reaches the SQL.
+    """
+    match = _SELECT_ITEM_RE.match(item)
+    if not match:
+        raise ValueError(f"Invalid SQL identifier: {item!r}")
+    alias, column, path = match.groups()
+    sql = _quote_identifier(column)
+    name = column
+    for arrow, key in _JSON_PATH_RE.findall(path):
+        # Keys match the identifier pattern or are digits, so they are safe as literals
+        sql += f"{arrow}{key}" if key.isdigit() else f"{arrow}'{key}'"
+        name = key
+    if alias or path:
+        sql += f' AS "{alias or name}"'
+    return sql
+
+
+def _select_columns(columns: str) -> str:
+    """Render a PostgREST select list ("*" passes through)."""
+    if columns == "*":
+        return "*"
+    return ", ".join(_select_item(item.strip()) for item in columns.split(","))
+
+
+def _column_names(cur: Any) -> list[str]:
+    return [d[0] for d in cur.description]
+
+
+def _fetch_dicts(cur: Any) -> list[dict[str, Any]]:
+    """Fetch all rows of a tuple cursor as dicts, reading column names once."""
+    if not cur.description:
+        return []
+    cols = _column_names(cur)
+    return [dict(zip(cols, row, strict=True)) for row in cur.fetchall()]
+
+
+def _close_stream(cur: Any, release: Callable[[], None]) -> None:
+    try:
+        cur.close()
+    finally:
+        release()
+
+
+class _RowStream:
+    """
+    Rows of a streaming RPC result as dicts, fetched in fetchmany batches.
+
+    The stream owns the cursor and its connection lease: both are given back
+    once the rows run out, the stream is closed, or it is garbage collected.
+    Releasing earlier is unsafe because the pool may close a returned
+    connection, and its cursor with it, before the rows are read.
+    """
+
+    def __init__(self, cur: Any, release: Callable[[], None]) -> None:
+        self._cur = cur
+        self._cols = _column_names(cur)
+        self._batch: Iterator[tuple[Any, ...]] = iter(())
+        self._finalizer = weakref.finalize(self, _close_stream, cur, release)
+
+    def __iter__(self) -> _RowStream:
+        return self
+
+    def __next__(self) -> dict[str, Any]:
+        row = next(self._batch, None)
+        if row is None:
+            if not self._finalizer.alive:
+                raise StopIteration
+            try:
+                rows = self._cur.fetchmany(_FETCH_SIZE)
+            except Exception:
+                self.close()
+                raise
+            if not rows:
+                self.close()
+                raise StopIteration
+            self._batch = iter(rows)
+            row = next(self._batch)
+        return dict(zip(self._cols, row, strict=True))
+
+    def close(self) -> None:
+        """Close the cursor and return the connection; safe to call more than once."""
+        self._finalizer()
+
+
+# Longest params repr written to debug logs (embeddings and JSONB would flood them)
+_LOG_PARAMS_MAX = 200
+
+
+def _params_for_log(params: Any) -> str:
+    """Truncated repr of bound parameters for debug logging."""
+    text = repr(params)
+    return text if len(text) <= _LOG_PARAMS_MAX else text[:_LOG_PARAMS_MAX] + "..."
+
+
+def _copy_value(v: Any) -> str:
+    """Convert a Python value to a COPY text-format field (None → \\N)."""
+    if v is None:
+        return "\\N"
+    if type(v) is str:
+        text = v
+    elif isinstance(v, (dict, list)):
+        text = _json_dumps(v)
+    elif hasattr(v, "tolist"):
+        # numpy arrays (embeddings) → pgvector/JSON array literal
+        text = _json_dumps(v.tolist())
+    else:
+        text = str(v)
+    # Backslash first so the escapes added below are not doubled
+    if "\\" in text:
+        text = text.replace("\\", "\\\\")
+    if "\t" in text:
+        text = text.replace("\t", "\\t")
+    if "\n" in text:
+        text = text.replace("\n", "\\n")
+    if "\r" in text:
+        text = text.replace("\r", "\\r")
+    return text
+
+
+_PLACEHOLDER_RE = re.compile(r"%([s%])")
+
+
+def _to_positional(sql: str) -> str:
+    """Translate psycopg2 ``%s`` placeholders into PostgreSQL ``$n`` parameters."""
+    counter = 0
+
+    def _replace(match: re.Match[str]) -> str:
+        nonlocal counter
+        if match.group(1) == "%":
+            return "%"
+        counter += 1
+        return f"${counter}"
+
+    return _PLACEHOLDER_RE.sub(_replace, sql)
+
+
+class _StatementCache:
+    """
+    Per-connection LRU of server-side prepared statements keyed by SQL template.
+
+    The fluent builders emit the same SQL template for every call that shares a
+    table, filter columns and ordering, so repeated calls skip the parse/plan
+    step by running ``EXECUTE`` against a statement prepared on first use.
+    A max_size of 0 disables the cache. It must stay disabled behind
+    transaction-mode poolers such as pgBouncer or the Supabase pooler on port
+    6543, which hand each transaction a different server session, so a
+    statement prepared in one is missing in the next.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._by_conn: weakref.WeakKeyDictionary[Any, OrderedDict[str, str]] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def execute(self, cur: Any, sql: str, params: list[Any]) -> None:
+        """Execute sql on cur, preparing it on the cursor's connection first if needed."""
+        if self._max_size <= 0:
+            cur.execute(sql, params)
+            return
+
+        with self._lock:
+            statements = self._by_conn.setdefault(cur.connection, OrderedDict())
+
+        name = statements.get(sql)
+        if name is None:
+            name = "s" + hashlib.blake2b(sql.encode(), digest_size=8).hexdigest()
+            # No params passed: psycopg2 leaves literal % untouched
+            cur.execute(f"PREPARE {name} AS {_to_positional(sql)}")
+            statements[sql] = name
+            if len(statements) > self._max_size:
+                _, evicted = statements.popitem(last=False)
+                cur.execute(f"DEALLOCATE {evicted}")
+        else:
+            statements.move_to_end(sql)
+
+        if params:
+            cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cur.execute(f"EXECUTE {name}")
+
+    @staticmethod
+    def is_stale(error: BaseException) -> bool:
+        """Whether error means a cached statement is missing on the server or its plan is out of date."""
+        if isinstance(error, psycopg2.errors.InvalidSqlStatementName):
+            return True
+        return isinstance(error, psycopg2.errors.FeatureNotSupported) and (
+            "cached plan must not change result type" in str(error)
+        )
+
+    def reset(self, conn: Any) -> None:
+        """
+        Drop every statement prepared on conn.
+
+        Called after an execute fails with an is_stale() error, e.g. when a
+        schema change invalidated a plan, so the statements are re-prepared.
+        """
+        with self._lock:
+            statements = self._by_conn.pop(conn, None)
+        if not statements or conn.closed:
+            return
+        try:
+            with conn.cursor() as cur:
+                cur.execute("DEALLOCATE ALL")
+            conn.rollback()
+        except psycopg2.Error as e:
+            logger.warning("Could not deallocate prepared statements: %s", e)
+
+
+def _register_vector_types(conn: Any) -> None:
+    """Register pgvector type adapters on a connection (numpy arrays in, Vector out)."""
+    try:
+        from pgvector.psycopg2 import register_vector
+
+        register_vector(conn)
+    except ImportError:
+        logger.debug("pgvector Python package not installed; vector columns will use list representation")
+    except Exception as e:
+        logger.warning("Could not register pgvector adapters: %s", e)
+    finally:
+        # The type lookup opened a transaction; leave the connection idle
+        conn.rollback()
+
+
+class _ConnectionPool(psycopg2.pool.ThreadedConnectionPool):
+    """
+    Threaded pool that registers pgvector adapters on every connection it opens.
+    register_vector() is connection-scoped, so registering once at startup
+    would only cover the first pooled connection.
+
+    minconn only sets how many connections are opened up front. Returned
+    connections stay open up to maxconn; psycopg2 would otherwise close every
+    one beyond minconn, so each statement would reconnect and lose its
+    prepared statements.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, *args: Any, **kwargs: Any) -> None:
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        # _putconn keeps a returned connection while fewer than minconn are idle
+        self.minconn = maxconn
+
+    def _connect(self, key: Any = None) -> Any:
+        conn = super()._connect(key)
+        _register_vector_types(conn)
+        return conn
+
+
+class _LeasedConnections:
+    """
+    Checks a pool connection out for each statement and returns it afterwards.
+
+    Checked-out connections run in autocommit mode. Inside transaction() the
+    calling thread keeps one connection, with autocommit off, until the block
+    ends. When every connection is in use, callers wait for one to be returned
+    (up to _CHECKOUT_TIMEOUT seconds) instead of failing.
+    """
+
+    def __init__(self, pool: _ConnectionPool, max_conn: int) -> None:
+        self._pool = pool
+        self._max_conn = max_conn
+        self._available = threading.BoundedSemaphore(max_conn)
+        self._local = threading.local()
+        # Connections whose session has synchronous_commit off
+        self._async_commit: weakref.WeakSet[Any] = weakref.WeakSet()
+
+    def acquire(self, synchronous: bool = True) -> Any:
+        """
+        Connection for one statement.
+
+        synchronous=False turns synchronous_commit off for the connection's
+        session; the setting is only changed (one SET or RESET) when the next
+        statement on that connection wants the other mode, so a run of ingest
+        inserts pays for it once. Inside transaction() the block's own setting
+        applies instead.
+        """
+        conn = getattr(self._local, "transaction_conn", None)
+        if conn is not None:
+            return conn
+        conn = self._checkout()
+        try:
+            self._set_synchronous_commit(conn, synchronous)
+        except BaseException:
+            self._putconn(conn)
+            raise
+        return conn
+
+    def release(self, conn: Any) -> None:
+        if conn is not getattr(self._local, "transaction_conn", None):
+            self._putconn(conn)
+
+    def begin(self) -> Any:
+        """Check out a connection for the calling thread's transaction, autocommit off."""
+        if getattr(self._local, "transaction_conn", None) is not None:
+            raise RuntimeError("Nested transaction() blocks on the same thread are not supported")
+        conn = self._checkout()
+        try:
+            self._set_synchronous_commit(conn, True)
+        except BaseException:
+            self._putconn(conn)
+            raise
+        conn.autocommit = False
+        self._local.transaction_conn = conn
+        return conn
+
+    def end(self, conn: Any) -> None:
+        """Return the transaction's connection to the pool in autocommit mode."""
+        self._local.transaction_conn = None
+        if not conn.closed:
+            conn.autocommit = True
+        self._putconn(conn)
+
+    def _set_synchronous_commit(self, conn: Any, synchronous: bool) -> None:
+        if synchronous != (conn in self._async_commit):
+            return
+        with conn.cursor() as cur:
+            cur.execute("RESET synchronous_commit" if synchronous else "SET synchronous_commit = off")
+        if synchronous:
+            self._async_commit.discard(conn)
+        else:
+            self._async_commit.add(conn)
+
+    def _checkout(self) -> Any:
+        if not self._available.acquire(timeout=_CHECKOUT_TIMEOUT):
+            raise RuntimeError(
+                f"PostgreSQL pool exhausted: all {self._max_conn} connections stayed in use for "
+                f"{_CHECKOUT_TIMEOUT:.0f}s. Raise POSTGRES_POOL_MAX."
+            )
+        try:
+            conn = self._pool.getconn()
+            if conn.closed:
+                # Server closed the connection while it was idle; replace it
+                self._pool.putconn(conn, close=True)
+                conn = self._pool.getconn()
+            if not conn.autocommit:
+                conn.autocommit = True
+            return conn
+        except BaseException:
+            self._available.release()
+            raise
+
+    def _putconn(self, conn: Any) -> None:
+        try:
+            self._pool.putconn(conn, close=bool(conn.closed))
+        except psycopg2.pool.PoolError:
+            # Pool already closed (shutdown) — nothing left to return to
+            pass
+        finally:
+            self._available.release()
+
+
+class _PinnedConnection:
+    """Hands out the same connection for every execute() inside a transaction."""
+
+    def __init__(self, conn: Any) -> None:
+        self._conn = conn
+
+    def acquire(self, synchronous: bool = True) -> Any:
+        return self._conn
+
+    def release(self, conn: Any) -> None:
+        pass
+
+
+# Single-value filter kinds → (SQL after the quoted column, parameter adapter)
+_FILTER_SQL: dict[str, tuple[str, Any]] = {
+    "eq": (" = %s", _adapt_value),
+    "neq": (" != %s", _adapt_value),
+    "gte": (" >= %s", _adapt_value),
+    "lte": (" <= %s", _adapt_value),
+    "ilike": (" ILIKE %s", lambda v: v),
+    # JSONB containment operator @>
+    "contains": (" @> %s::jsonb", _to_json),
+}
+
+
+def _filter_shape(filters: list[_Filter]) -> tuple[tuple[tuple[Any, ...], ...], list[Any]]:
+    """
+    Split filters into a hashable shape (kinds and columns, no values) and
+    the parameter list, so SQL text can be memoized per query shape.
+    """
+    shape: list[tuple[Any, ...]] = []
     params: list[Any] = []
     for f in filters:
         if f.kind == "or":
             # PostgREST-style OR string, e.g. "col.eq.val,col2.is.null"
-            or_clause = _parse_or_filter(f.value)
-            if or_clause:
-                clauses.append(f"({or_clause})")
-            continue
-        col = _quote_identifier(f.column)
-        if f.kind == "eq":
-            clauses.append(f"{col} = %s")
-            params.append(_adapt_value(f.value))
-        elif f.kind == "neq":
-            clauses.append(f"{col} != %s")
-            params.append(_adapt_value(f.value))
+            or_clause, or_params = _parse_or_filter(f.value)
+            shape.append(("or", or_clause))
+            params.extend(or_params)
         elif f.kind == "in":
-            placeholders = ",".join(["%s"] * len(f.value))
-            clauses.append(f"{col} = ANY(ARRAY[{placeholders}])")
-            params.extend(_adapt_value(item) for item in f.value)
-        elif f.kind == "gte":
-            clauses.append(f"{col} >= %s")
-            params.append(_adapt_value(f.value))
-        elif f.kind == "lte":
-            clauses.append(f"{col} <= %s")
-            params.append(_adapt_value(f.value))
-        elif f.kind == "ilike":
-            clauses.append(f"{col} ILIKE %s")
-            params.append(f.value)
-        elif f.kind == "contains":
-            # JSONB containment operator @>
-            clauses.append(f"{col} @> %s::jsonb")
-            params.append(psycopg2.extras.Json(f.value))
-    return "WHERE " + " AND ".join(clauses), params
-
-
-def _parse_or_filter(filter_str: str) -> str:
+            # One array parameter: the SQL text (and its prepared plan) does not
+            # depend on the list length. psycopg2 adapts lists to ARRAY[...].
+            shape.append(("in", f.column))
+            params.append([_adapt_value(item) for item in f.value])
+        else:
+            shape.append((f.kind, f.column))
+            params.append(_FILTER_SQL[f.kind][1](f.value))
+    return tuple(shape), params
+
+
+@functools.lru_cache(maxsize=512)
+def _where_sql(shape: tuple[tuple[Any, ...], ...]) -> str:
+    """Build the WHERE clause for a filter shape ("" when nothing filters)."""
+    clauses: list[str] = []
+    for kind, *spec in shape:
+        if kind == "or":
+            if spec[0]:
+                clauses.append(f"({spec[0]})")
+            continue
+        col = _quote_identifier(spec[0])
+        if kind == "in":
+            # The array's element type must compare with the column type
+            # (a list of str matches text columns, not uuid) for the index to apply.
+            clauses.append(f"{col} = ANY(%s)")
+        else:
+            clauses.append(col + _FILTER_SQL[kind][0])
+    if not clauses:
+        return ""
+    return "WHERE " + " AND ".join(clauses)
+
+
+def _build_where(filters: list[_Filter]) -> tuple[str, list[Any]]:
+    """Build WHERE clause and parameters list from filters."""
+    shape, params = _filter_shape(filters)
+    return _where_sql(shape), params
+
+
+# ---------------------------------------------------------------------------
+# SQL templates, memoized per query shape (identical text → shared str objects
+# whose hashes are cached for the prepared-statement lookup)
+# ---------------------------------------------------------------------------
+
+
+# ORDER BY direction keyword, indexed by the desc flag
+_ORDER_DIR = ("ASC", "DESC")
+
+
+def _with_where(sql: str, where_shape: tuple[tuple[Any, ...], ...]) -> str:
+    where_clause = _where_sql(where_shape)
+    return f"{sql} {where_clause}" if where_clause else sql
+
+
+@functools.lru_cache(maxsize=512)
+def _select_sql(
+    table: str,
+    columns: str,
+    where_shape: tuple[tuple[Any, ...], ...],
+    orders: tuple[tuple[str, bool], ...],
+    has_limit: bool,
+    has_offset: bool,
+) -> str:
+    sql = _with_where(f"SELECT {_select_columns(columns)} FROM {_quote_identifier(table)}", where_shape)
+    if orders:
+        sql += " ORDER BY " + ", ".join(f"{_quote_identifier(col)} {_ORDER_DIR[d]}" for col, d in orders)
+    # limit/offset are bound parameters, so every page of a scan shares one template
+    if has_limit:
+        sql += " LIMIT %s"
+    if has_offset:
+        sql += " OFFSET %s"
+    return sql
+
+
+@functools.lru_cache(maxsize=512)
+def _count_sql(table: str, where_shape: tuple[tuple[Any, ...], ...]) -> str:
+    return _with_where(f"SELECT COUNT(*) AS count FROM {_quote_identifier(table)}", where_shape)
+
+
+@functools.lru_cache(maxsize=512)
+def _update_sql(table: str, set_cols: tuple[str, ...], where_shape: tuple[tuple[Any, ...], ...]) -> str:
+    set_parts = [f"{_quote_identifier(k)} = %s" for k in set_cols]
+    return _with_where(f"UPDATE {_quote_identifier(table)} SET {', '.join(set_parts)}", where_shape) + " RETURNING *"
+
+
+@functools.lru_cache(maxsize=512)
+def _delete_sql(table: str, where_shape: tuple[tuple[Any, ...], ...]) -> str:
+    return _with_where(f"DELETE FROM {_quote_identifier(table)}", where_shape) + " RETURNING *"
+
+
+@functools.lru_cache(maxsize=512)
+def _insert_sql(table: str, cols: tuple[str, ...], upsert: bool, conflict_target: str) -> str:
+    """INSERT/UPSERT statement with a single VALUES %s marker for execute_values."""
+    tbl = _quote_identifier(table)
+    col_sql = ", ".join(_quote_identifier(k) for k in cols)
+    if not upsert:
+        return f"INSERT INTO {tbl} ({col_sql}) VALUES %s RETURNING *"
+
+    # Build SET clause (exclude conflict column and created_at)
+    exclude_cols = {conflict_target, "created_at", "id"} if conflict_target else {"id", "created_at"}
+    update_parts = [f"{_quote_identifier(k)} = EXCLUDED.{_quote_identifier(k)}" for k in cols if k not in exclude_cols]
+    if conflict_target and update_parts:
+        conflict_sql = f" ON CONFLICT ({_quote_columns(conflict_target)}) DO UPDATE SET {', '.join(update_parts)}"
+    else:
+        conflict_sql = " ON CONFLICT DO NOTHING"
+    return f"INSERT INTO {tbl} ({col_sql}) VALUES %s{conflict_sql} RETURNING *"
+
+
+def _parse_or_filter(filter_str: str) -> tuple[str, list[Any]]:
     """
-    Parse a PostgREST-style OR filter string into a SQL OR clause.
+    Parse a PostgREST-style OR filter string into a SQL OR clause and its parameters.
     Supports: col.eq.val | col.ilike.val | col.is.null | col.is.false | col.is.true
     Multiple conditions are comma-separated.
     Example: "title.ilike.%foo%,summary.ilike.%foo%"
@@ -111,6 +629,7 @@ def _parse_or_filter(filter_str: str) -> str:
     """
     parts = filter_str.split(",")
     sql_parts: list[str] = []
+    params: list[Any] = []
     for part in parts:
         part = part.strip()
         segments = part.split(".", 2)
@@ -122,11 +641,14 @@ def _parse_or_filter(filter_str: str) -> str:
         except ValueError:
             continue
         if op == "eq":
-            sql_parts.append(f"{col_quoted} = '{val}'")
+            sql_parts.append(f"{col_quoted} = %s")
+            params.append(val)
         elif op == "neq":
-            sql_parts.append(f"{col_quoted} != '{val}'")
+            sql_parts.append(f"{col_quoted} != %s")
+            params.append(val)
         elif op == "ilike":
-            sql_parts.append(f"{col_quoted} ILIKE '{val}'")
+            sql_parts.append(f"{col_quoted} ILIKE %s")
+            params.append(val)
         elif op == "is":
             if val == "null":
                 sql_parts.append(f"{col_quoted} IS NULL")
@@ -137,7 +659,7 @@ def _parse_or_filter(filter_str: str) -> str:
         elif op == "not":
             # e.g. col.not.is.null — simplified handling
             sql_parts.append(f"{col_quoted} IS NOT NULL")
-    return " OR ".join(sql_parts)
+    return " OR ".join(sql_parts), params
 
 
 # ---------------------------------------------------------------------------
@@ -151,12 +673,22 @@ class PostgresTableQueryBuilder:
     Builds and executes a single SQL statement per execute() call.
     """
 
-    def __init__(self, pool: psycopg2.pool.ThreadedConnectionPool, table: str) -> None:
-        self._pool = pool
+    def __init__(
+        self,
+        connections: _LeasedConnections | _PinnedConnection,
+        table: str,
+        statements: _StatementCache,
+        executor: Executor | None = None,
+    ) -> None:
+        self._connections = connections
         self._table = table
+        self._statements = statements
+        self._executor = executor
         self._op: _Op | None = None
         self._columns: str = "*"
         self._data: dict[str, Any] | list[dict[str, Any]] | None = None
+        self._returning: str = "representation"  # "minimal" skips RETURNING *
+        self._synchronous: bool = True  # False commits inserts without waiting for the WAL flush
         self._on_conflict: str = ""
         self._filters: list[_Filter] = []
         self._orders: list[tuple[str, bool]] = []  # (column, desc)
@@ -179,10 +711,25 @@ class PostgresTableQueryBuilder:
     # --- Mutations ---
 
     def insert(
-        self, data: dict[str, Any] | list[dict[str, Any]]
+        self,
+        data: dict[str, Any] | list[dict[str, Any]],
+        *,
+        returning: str = "representation",
+        synchronous: bool = True,
     ) -> PostgresTableQueryBuilder:
+        """
+        Insert one or more rows.
+
+        returning="minimal" returns no rows (as in supabase-py) and lets large
+        batches stream through COPY FROM STDIN instead of INSERT.
+        synchronous=False runs the insert with synchronous_commit off: the
+        commit does not wait for the WAL flush, and a server crash can lose it
+        (never corrupts). Only for rows that are safe to re-create.
+        """
         self._op = _Op.INSERT
         self._data = data
+        self._returning = returning
+        self._synchronous = synchronous
         return self
 
     def update(self, data: dict[str, Any]) -> PostgresTableQueryBuilder:
@@ -243,17 +790,17 @@ class PostgresTableQueryBuilder:
     # --- Ordering / pagination ---
 
     def order(self, column: str, *, desc: bool = False) -> PostgresTableQueryBuilder:
-        self._orders.append((column, desc))
+        self._orders.append((column, bool(desc)))
         return self
 
     def limit(self, count: int) -> PostgresTableQueryBuilder:
-        self._limit_val = count
+        self._limit_val = int(count)
         return self
 
     def range(self, start: int, end: int) -> PostgresTableQueryBuilder:
         """Inclusive range pagination: start and end are 0-based row indices."""
-        self._offset_val = start
-        self._limit_val = end - start + 1
+        self._offset_val = int(start)
+        self._limit_val = int(end) - self._offset_val + 1
         return self
 
     # --- Execution ---
@@ -261,136 +808,129 @@ class PostgresTableQueryBuilder:
     def execute(self) -> APIResponse:  # noqa: F821
         from .protocol import APIResponse
 
-        conn = self._pool.getconn()
+        conn = self._connections.acquire(self._synchronous)
         try:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            with conn.cursor() as cur:
                 if self._count_mode:
                     # Run a COUNT(*) query to populate APIResponse.count
                     count_sql, count_params = self._build_count_sql()
-                    logger.debug("PostgreSQL count: %s | params=%s", count_sql, count_params)
-                    cur.execute(count_sql, count_params)
-                    conn.commit()
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("PostgreSQL count: %s | params=%s", count_sql, _params_for_log(count_params))
+                    self._statements.execute(cur, count_sql, count_params)
                     row = cur.fetchone()
-                    count_val = row["count"] if row else 0
+                    count_val = row[0] if row else 0
                     if self._head_mode:
                         # head=True means return count only, no data rows
                         return APIResponse(data=[], count=count_val)
                     # count="exact" without head: return data rows + count
                     sql, params = self._build_sql()
-                    cur.execute(sql, params)
-                    rows = cur.fetchall() if cur.description else []
-                    data = [dict(r) for r in rows]
-                    return APIResponse(data=data, count=count_val)
+                    self._statements.execute(cur, sql, params)
+                    return APIResponse(data=_fetch_dicts(cur), count=count_val)
+
+                if self._op is _Op.INSERT or self._op is _Op.UPSERT:
+                    data = self._execute_insert(cur)
+                    return APIResponse(data=data)
 
                 sql, params = self._build_sql()
-                logger.debug("PostgreSQL execute: %s | params=%s", sql, params)
-                cur.execute(sql, params)
-                conn.commit()
-                rows = cur.fetchall() if cur.description else []
-                data = [dict(r) for r in rows]
-                return APIResponse(data=data)
-        except Exception:
-            conn.rollback()
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("PostgreSQL execute: %s | params=%s", sql, _params_for_log(params))
+                self._statements.execute(cur, sql, params)
+                return APIResponse(data=_fetch_dicts(cur))
+        except Exception as e:
+            # Inside transaction() the enclosing block owns rollback
+            if conn.autocommit and _StatementCache.is_stale(e):
+                self._statements.reset(conn)
             raise
         finally:
-            self._pool.putconn(conn)
+            self._connections.release(conn)
+
+    async def aexecute(self) -> APIResponse:  # noqa: F821
+        """Run execute() on the client's database executor without blocking the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.execute)
+
+    def _execute_insert(self, cur: Any) -> list[dict[str, Any]]:
+        """
+        Run INSERT/UPSERT through execute_values.
+
+        Rows are expanded into a multi-row VALUES list in pages of
+        _INSERT_PAGE_SIZE, with RETURNING rows collected across pages.
+        """
+        data = self._data or []
+        rows = data if isinstance(data, list) else [data]
+        if not rows:
+            return []
+        cols = list(rows[0].keys())
+        minimal = self._op is _Op.INSERT and self._returning == "minimal"
+        if minimal and len(rows) >= _COPY_MIN_ROWS:
+            self._copy_rows(cur, cols, rows)
+            return []
+
+        sql = self._build_insert_sql(cols)
+        if minimal:
+            sql = sql.removesuffix(" RETURNING *")
+        adapt = _adapt_value
+        values = [tuple([adapt(row[col]) for col in cols]) for row in rows]
+        logger.debug("PostgreSQL execute_values: %s | rows=%d", sql, len(values))
+        returned = psycopg2.extras.execute_values(
+            cur, sql, values, page_size=_INSERT_PAGE_SIZE, fetch=not minimal
+        )
+        if not returned:
+            return []
+        cols = _column_names(cur)
+        return [dict(zip(cols, row, strict=True)) for row in returned]
+
+    def _copy_rows(self, cur: Any, cols: list[str], rows: list[dict[str, Any]]) -> None:
+        """Stream rows into the table with COPY FROM STDIN (text format, backslash-escaped)."""
+        copy_value = _copy_value
+        buf = io.StringIO(
+            "".join("\t".join([copy_value(row[col]) for col in cols]) + "\n" for row in rows)
+        )
+        col_sql = ", ".join(_quote_identifier(col) for col in cols)
+        sql = f"COPY {_quote_identifier(self._table)} ({col_sql}) FROM STDIN"
+        logger.debug("PostgreSQL copy: %s | rows=%d", sql, len(rows))
+        cur.copy_expert(sql, buf)
+
+    def _build_insert_sql(self, cols: list[str]) -> str:
+        """Build an INSERT/UPSERT statement with a single VALUES %s marker for execute_values."""
+        if self._op is _Op.INSERT:
+            return _insert_sql(self._table, tuple(cols), False, "")
+        # Determine conflict target
+        conflict_target = self._on_conflict if self._on_conflict else self._infer_conflict_column()
+        return _insert_sql(self._table, tuple(cols), True, conflict_target)
 
     def _build_count_sql(self) -> tuple[str, list[Any]]:
         """Build a COUNT(*) query using current filters."""
-        tbl = self._table
-        where_clause, where_params = _build_where(self._filters)
-        sql = f"SELECT COUNT(*) AS count FROM {tbl}"
-        if where_clause:
-            sql += " " + where_clause
-        return sql, where_params
+        where_shape, where_params = _filter_shape(self._filters)
+        return _count_sql(self._table, where_shape), where_params
 
     # --- Internal SQL builder ---
 
     def _build_sql(self) -> tuple[str, list[Any]]:
-        tbl = self._table  # already sanitized by caller via psycopg2 quoting
-        where_clause, where_params = _build_where(self._filters)
+        tbl = self._table  # quoted by the template builders
+        where_shape, where_params = _filter_shape(self._filters)
 
         if self._op is _Op.SELECT:
-            cols = self._columns if self._columns != "*" else "*"
-            sql = f"SELECT {cols} FROM {tbl}"
-            params = []
-            if where_clause:
-                sql += " " + where_clause
-                params.extend(where_params)
-            if self._orders:
-                order_parts = [
-                    f"{col} {'DESC' if d else 'ASC'}" for col, d in self._orders
-                ]
-                sql += " ORDER BY " + ", ".join(order_parts)
+            sql = _select_sql(
+                tbl,
+                self._columns,
+                where_shape,
+                tuple(self._orders),
+                self._limit_val is not None,
+                self._offset_val is not None,
+            )
             if self._limit_val is not None:
-                sql += f" LIMIT {int(self._limit_val)}"
+                where_params.append(self._limit_val)
             if self._offset_val is not None:
-                sql += f" OFFSET {int(self._offset_val)}"
-            return sql, params
-
-        if self._op is _Op.INSERT:
-            rows = self._data if isinstance(self._data, list) else [self._data]
-            if not rows:
-                return f"SELECT * FROM {tbl} WHERE FALSE", []
-            cols = list(rows[0].keys())
-            col_sql = ", ".join(cols)
-            row_placeholders = "(" + ", ".join(["%s"] * len(cols)) + ")"
-            all_placeholders = ", ".join([row_placeholders] * len(rows))
-            params: list[Any] = []
-            for row in rows:
-                for col in cols:
-                    params.append(_adapt_value(row[col]))
-            sql = f"INSERT INTO {tbl} ({col_sql}) VALUES {all_placeholders} RETURNING *"
-            return sql, params
+                where_params.append(self._offset_val)
+            return sql, where_params
 
         if self._op is _Op.UPDATE:
             data = self._data or {}
-            set_parts = [f"{k} = %s" for k in data]
             set_params = [_adapt_value(v) for v in data.values()]
-            sql = f"UPDATE {tbl} SET {', '.join(set_parts)}"
-            all_params = set_params
-            if where_clause:
-                sql += " " + where_clause
-                all_params = set_params + where_params
-            sql += " RETURNING *"
-            return sql, all_params
+            return _update_sql(tbl, tuple(data), where_shape), set_params + where_params
 
         if self._op is _Op.DELETE:
-            sql = f"DELETE FROM {tbl}"
-            params = []
-            if where_clause:
-                sql += " " + where_clause
-                params = where_params
-            sql += " RETURNING *"
-            return sql, params
-
-        if self._op is _Op.UPSERT:
-            rows = self._data if isinstance(self._data, list) else [self._data]
-            if not rows:
-                return f"SELECT * FROM {tbl} WHERE FALSE", []
-            cols = list(rows[0].keys())
-            col_sql = ", ".join(cols)
-            row_placeholders = "(" + ", ".join(["%s"] * len(cols)) + ")"
-            all_placeholders = ", ".join([row_placeholders] * len(rows))
-            params = []
-            for row in rows:
-                for col in cols:
-                    params.append(_adapt_value(row[col]))
-            # Determine conflict target
-            conflict_target = self._on_conflict if self._on_conflict else self._infer_conflict_column()
-            # Build SET clause (exclude conflict column and created_at)
-            exclude_cols = {conflict_target, "created_at", "id"} if conflict_target else {"id", "created_at"}
-            update_parts = [f"{k} = EXCLUDED.{k}" for k in cols if k not in exclude_cols]
-            if conflict_target and update_parts:
-                conflict_sql = (
-                    f" ON CONFLICT ({conflict_target}) DO UPDATE SET {', '.join(update_parts)}"
-                )
-            elif update_parts:
-                conflict_sql = " ON CONFLICT DO NOTHING"
-            else:
-                conflict_sql = " ON CONFLICT DO NOTHING"
-            sql = f"INSERT INTO {tbl} ({col_sql}) VALUES {all_placeholders}{conflict_sql} RETURNING *"
-            return sql, params
+            return _delete_sql(tbl, where_shape), where_params
 
         raise ValueError(f"No operation set on query builder for table {tbl}")
 
@@ -417,39 +957,87 @@ class PostgresRpcQueryBuilder:
     """
 
     def __init__(
-        self, pool: psycopg2.pool.ThreadedConnectionPool, func: str, params: dict[str, Any]
+        self,
+        connections: _LeasedConnections | _PinnedConnection,
+        func: str,
+        params: dict[str, Any],
+        statements: _StatementCache,
+        executor: Executor | None = None,
     ) -> None:
-        self._pool = pool
+        self._connections = connections
         self._func = func
         self._params = params
+        self._statements = statements
+        self._executor = executor
 
-    def execute(self) -> APIResponse:  # noqa: F821
+    def execute(self, *, stream: bool = False) -> APIResponse:  # noqa: F821
+        """
+        Call the function and return its rows.
+
+        stream=True leaves data unset and hands rows to APIResponse.iter_data()
+        in fetchmany batches, skipping the fetchall list.
+        """
         from .protocol import APIResponse
 
-        conn = self._pool.getconn()
+        conn = self._connections.acquire()
+        cur = conn.cursor()
+        streaming = False
         try:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                # Build named-parameter function call
-                named = ", ".join(f"{k} => %s" for k in self._params)
-                sql = f"SELECT * FROM {self._func}({named})"
-                # Convert list/dict params to Json for JSONB params
-                param_vals = []
-                for v in self._params.values():
-                    if isinstance(v, (dict, list)):
-                        param_vals.append(psycopg2.extras.Json(v))
-                    else:
-                        param_vals.append(v)
+            # Build named-parameter function call
+            named = ", ".join(f"{_quote_identifier(k)} => %s" for k in self._params)
+            sql = f"SELECT * FROM {_quote_identifier(self._func)}({named})"
+            # Convert list/dict params to Json for JSONB params
+            param_vals = [_adapt_value(v) for v in self._params.values()]
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug("PostgreSQL RPC: %s | params=%s", sql, list(self._params.keys()))
-                cur.execute(sql, param_vals)
-                conn.commit()
-                rows = cur.fetchall() if cur.description else []
-                data = [dict(r) for r in rows]
-                return APIResponse(data=data)
-        except Exception:
-            conn.rollback()
+            self._statements.execute(cur, sql, param_vals)
+            if stream and cur.description:
+                rows = _RowStream(cur, functools.partial(self._connections.release, conn))
+                streaming = True
+                return APIResponse(rows=rows)
+            return APIResponse(data=_fetch_dicts(cur))
+        except Exception as e:
+            # Inside transaction() the enclosing block owns rollback
+            if conn.autocommit and _StatementCache.is_stale(e):
+                self._statements.reset(conn)
             raise
         finally:
-            self._pool.putconn(conn)
+            # A streaming result keeps its cursor and connection until _RowStream
+            # has handed out every row or is closed
+            if not streaming:
+                cur.close()
+                self._connections.release(conn)
+
+    async def aexecute(self, *, stream: bool = False) -> APIResponse:  # noqa: F821
+        """Run execute() on the client's database executor without blocking the event loop."""
+        call = functools.partial(self.execute, stream=stream)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+
+# ---------------------------------------------------------------------------
+# Transaction scope
+# ---------------------------------------------------------------------------
+
+
+class PostgresTransaction:
+    """
+    Table/RPC entry points bound to one connection inside
+    PostgresDatabaseClient.transaction(); statements commit together on exit.
+    """
+
+    def __init__(self, conn: Any, statements: _StatementCache) -> None:
+        self._connections = _PinnedConnection(conn)
+        self._statements = statements
+
+    def table(self, name: str) -> PostgresTableQueryBuilder:
+        return PostgresTableQueryBuilder(self._connections, name, self._statements)
+
+    def from_(self, name: str) -> PostgresTableQueryBuilder:
+        """Alias for table() — mirrors the supabase-py client.from_() API."""
+        return self.table(name)
+
+    def rpc(self, name: str, params: dict[str, Any]) -> PostgresRpcQueryBuilder:
+        return PostgresRpcQueryBuilder(self._connections, name, params, self._statements)
 
 
 # ---------------------------------------------------------------------------
@@ -460,48 +1048,71 @@ class PostgresRpcQueryBuilder:
 class PostgresDatabaseClient:
     """
     PostgreSQL-backed implementation of DatabaseClient.
-    Uses psycopg2 with a threaded connection pool.
+    Uses psycopg2 with a threaded connection pool, checking a connection out
+    per statement (per block inside transaction()), and a per-connection cache
+    of server-side prepared statements
+    (off by default; enable it only for direct server connections).
+    aexecute() runs queries on a dedicated thread pool with one worker fewer
+    than max_conn, leaving a connection for synchronous calls made on the
+    event-loop thread.
     Requires pgvector extension installed in target database.
     """
 
-    def __init__(self, dsn: str, min_conn: int = 1, max_conn: int = 10) -> None:
+    def __init__(
+        self, dsn: str, min_conn: int = 1, max_conn: int = 10, statement_cache_size: int = 0
+    ) -> None:
+        self._statements = _StatementCache(statement_cache_size)
         try:
-            self._pool = psycopg2.pool.ThreadedConnectionPool(min_conn, max_conn, dsn=dsn)
-            # Register pgvector type adapters if available
-            self._register_vector_types()
+            self._pool = _ConnectionPool(min_conn, max_conn, dsn=dsn)
+            self._connections = _LeasedConnections(self._pool, max_conn)
+            self._executor = ThreadPoolExecutor(max_workers=max(1, max_conn - 1), thread_name_prefix="archon-pg")
+            # Decode json/jsonb result columns with orjson
+            psycopg2.extras.register_default_json(globally=True, loads=orjson.loads)
+            psycopg2.extras.register_default_jsonb(globally=True, loads=orjson.loads)
             logger.info("PostgresDatabaseClient initialized (pool min=%d max=%d)", min_conn, max_conn)
         except Exception as e:
             raise RuntimeError(
                 f"Failed to connect to PostgreSQL (DSN={dsn!r}): {e}"
             ) from e
 
-    def _register_vector_types(self) -> None:
-        """Register pgvector type adapters for psycopg2."""
-        try:
-            from pgvector.psycopg2 import register_vector
-
-            conn = self._pool.getconn()
-            try:
-                register_vector(conn)
-            finally:
-                self._pool.putconn(conn)
-            logger.debug("pgvector type adapters registered")
-        except ImportError:
-            logger.debug("pgvector Python package not installed; vector columns will use list representation")
-        except Exception as e:
-            logger.warning("Could not register pgvector adapters: %s", e)
-
     def table(self, name: str) -> PostgresTableQueryBuilder:
-        return PostgresTableQueryBuilder(self._pool, name)
+        return PostgresTableQueryBuilder(self._connections, name, self._statements, self._executor)
 
     def from_(self, name: str) -> PostgresTableQueryBuilder:
         """Alias for table() — mirrors the supabase-py client.from_() API."""
         return self.table(name)
 
     def rpc(self, name: str, params: dict[str, Any]) -> PostgresRpcQueryBuilder:
-        return PostgresRpcQueryBuilder(self._pool, name, params)
+        return PostgresRpcQueryBuilder(self._connections, name, params, self._statements, self._executor)
+
+    @contextmanager
+    def transaction(self, *, synchronous: bool = True) -> Iterator[PostgresTransaction]:
+        """
+        Run every statement issued through the yielded scope in one transaction.
+
+        Commits on normal exit and rolls back if the block raises, so loops of
+        small writes pay for a single commit instead of one per statement.
+
+        synchronous=False sets synchronous_commit off for this transaction only:
+        the commit returns without waiting for the WAL flush, and a server
+        crash can lose it (never corrupts). Use it only for writes that are
+        safe to redo, such as re-crawlable bulk inserts.
+        """
+        conn = self._connections.begin()
+        try:
+            if not synchronous:
+                with conn.cursor() as cur:
+                    cur.execute("SET LOCAL synchronous_commit = off")
+            yield PostgresTransaction(conn, self._statements)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._connections.end(conn)
 
     def close(self) -> None:
-        """Close all connections in the pool."""
+        """Stop the executor and close all connections in the pool."""
+        self._executor.shutdown(wait=True)
         self._pool.closeall()
         logger.info("PostgresDatabaseClient pool closed")
@@ -8,6 +8,8 @@ do not need to inherit from these classes.
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
 from dataclasses import dataclass, field
 from typing import Any, Protocol, runtime_checkable
 
@@ -21,6 +23,23 @@ class APIResponse:
 
     data: list[dict[str, Any]] | dict[str, Any] | None = None
     count: int | None = None
+    # Set instead of data by execute(stream=True): rows are yielded as fetched
+    rows: Iterator[dict[str, Any]] | None = field(default=None, repr=False)
+
+    def iter_data(self) -> Iterator[dict[str, Any]]:
+        """
+        Iterate result rows once.
+
+        Streams rows when the response came from execute(stream=True);
+        otherwise walks data.
+        """
+        if self.rows is not None:
+            return self.rows
+        if self.data is None:
+            return iter(())
+        if isinstance(self.data, dict):
+            return iter((self.data,))
+        return iter(self.data)
 
 
 @runtime_checkable
@@ -30,8 +49,15 @@ class TableQueryBuilder(Protocol):
     # Column selection
     def select(self, columns: str = "*") -> "TableQueryBuilder": ...
 
-    # Mutation
-    def insert(self, data: dict[str, Any] | list[dict[str, Any]]) -> "TableQueryBuilder": ...
+    # Mutation (synchronous=False lets the insert's commit skip the WAL flush wait;
+    # re-creatable bulk loads only, and ignored inside transaction())
+    def insert(
+        self,
+        data: dict[str, Any] | list[dict[str, Any]],
+        *,
+        returning: str = "representation",
+        synchronous: bool = True,
+    ) -> "TableQueryBuilder": ...
     def update(self, data: dict[str, Any]) -> "TableQueryBuilder": ...
     def delete(self) -> "TableQueryBuilder": ...
     def upsert(
@@ -52,13 +78,17 @@ class TableQueryBuilder(Protocol):
 
     # Execution
     def execute(self) -> APIResponse: ...
+    # Same as execute(), awaited off the event loop thread
+    async def aexecute(self) -> APIResponse: ...
 
 
 @runtime_checkable
 class RpcQueryBuilder(Protocol):
     """Query builder for stored procedure / RPC calls."""
 
-    def execute(self) -> APIResponse: ...
+    # stream=True lets adapters hand rows to APIResponse.iter_data() lazily
+    def execute(self, *, stream: bool = False) -> APIResponse: ...
+    async def aexecute(self, *, stream: bool = False) -> APIResponse: ...
 
 
 @runtime_checkable
@@ -72,3 +102,8 @@ class DatabaseClient(Protocol):
 
     def table(self, name: str) -> TableQueryBuilder: ...
     def rpc(self, name: str, params: dict[str, Any]) -> RpcQueryBuilder: ...
+
+    # Groups writes into one transaction where the backend supports it;
+    # the yielded object exposes table() and rpc(). synchronous=False lets the
+    # commit return before WAL is flushed (idempotent bulk loads only)
+    def transaction(self, *, synchronous: bool = True) -> AbstractContextManager[Any]: ...
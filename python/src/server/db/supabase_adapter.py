@@ -8,6 +8,9 @@ Active when DB_PROVIDER=supabase (default).
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any
 
 from supabase import Client
@@ -33,9 +36,14 @@ class _SupabaseTableQueryBuilder:
     # --- Mutations ---
 
     def insert(
-        self, data: dict[str, Any] | list[dict[str, Any]]
+        self,
+        data: dict[str, Any] | list[dict[str, Any]],
+        *,
+        returning: str = "representation",
+        synchronous: bool = True,
     ) -> "_SupabaseTableQueryBuilder":
-        self._b = self._b.insert(data)
+        # synchronous is accepted for interface parity; PostgREST commits each request itself
+        self._b = self._b.insert(data, returning=returning)
         return self
 
     def update(self, data: dict[str, Any]) -> "_SupabaseTableQueryBuilder":
@@ -99,6 +107,9 @@ class _SupabaseTableQueryBuilder:
         native_response = self._b.execute()
         return APIResponse(data=native_response.data, count=getattr(native_response, "count", None))
 
+    async def aexecute(self) -> APIResponse:
+        return await asyncio.to_thread(self.execute)
+
 
 class _SupabaseRpcQueryBuilder:
     """Wraps a supabase-py RPC call and exposes execute()."""
@@ -106,10 +117,14 @@ class _SupabaseRpcQueryBuilder:
     def __init__(self, native_builder: Any) -> None:
         self._b = native_builder
 
-    def execute(self) -> APIResponse:
+    def execute(self, *, stream: bool = False) -> APIResponse:
+        # PostgREST returns the full JSON body; iter_data() walks data either way
         native_response = self._b.execute()
         return APIResponse(data=native_response.data, count=getattr(native_response, "count", None))
 
+    async def aexecute(self, *, stream: bool = False) -> APIResponse:
+        return await asyncio.to_thread(self.execute, stream=stream)
+
 
 class SupabaseDatabaseClient:
     """
@@ -125,3 +140,12 @@ class SupabaseDatabaseClient:
 
     def rpc(self, name: str, params: dict[str, Any]) -> _SupabaseRpcQueryBuilder:
         return _SupabaseRpcQueryBuilder(self._client.rpc(name, params))
+
+    @contextmanager
+    def transaction(self, *, synchronous: bool = True) -> Iterator[SupabaseDatabaseClient]:
+        """
+        PostgREST commits every request on its own, so this yields the client
+        unchanged; it exists so call sites can group writes provider-agnostically.
+        synchronous is accepted for interface parity and has no effect here.
+        """
+        yield self
@@ -140,6 +140,11 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             api_logger.warning("Could not cleanup crawling context: %s", e, exc_info=True)
 
+        # Stop PDF extraction workers
+        from .services.crawling.helpers.download_handler import shutdown_pdf_pool
+
+        shutdown_pdf_pool()
+
 
         api_logger.info("✅ Cleanup completed")
 
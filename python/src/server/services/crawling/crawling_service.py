@@ -1174,7 +1174,7 @@ class CrawlingService:
                 crawl_type=crawl_type,
             )
 
-            fallback_result = await asyncio.to_thread(try_extract_downloadable_document, url)
+            fallback_result = await try_extract_downloadable_document(url)
             crawl_results = [fallback_result] if fallback_result else []
 
         else:
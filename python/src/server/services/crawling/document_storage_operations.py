@@ -6,6 +6,8 @@ Extracted from crawl_orchestration_service.py for better modularity.
 """
 
 import asyncio
+import re
+from collections import defaultdict
 from collections.abc import Callable
 from typing import Any
 
@@ -18,6 +20,41 @@ from .code_extraction_service import CodeExtractionService
 
 logger = get_logger(__name__)
 
+# Text longer than this is word-counted in whitespace-aligned windows
+_WORD_COUNT_WINDOW = 65_536
+_WHITESPACE_RE = re.compile(r"\s")
+
+# Maximum concurrent AI summary requests when creating source records
+_SOURCE_SUMMARY_CONCURRENCY = 8
+# Leading characters of each content that may feed a source summary
+_SOURCE_SUMMARY_CONTENT_CHARS = 5000
+# llms-full sections are chunked in groups of about this many characters
+_LLMS_SECTION_GROUP_CHARS = 200_000
+
+
+def _count_words(text: str) -> int:
+    """
+    Count whitespace-delimited words exactly as len(text.split()) does.
+
+    Large documents are counted window by window, so the temporary token list
+    never holds more than one window's words instead of the whole document's.
+    """
+    if len(text) <= _WORD_COUNT_WINDOW:
+        return len(text.split())
+
+    count = 0
+    start = 0
+    length = len(text)
+    while start < length:
+        end = start + _WORD_COUNT_WINDOW
+        if end < length:
+            # Cut on whitespace so no word straddles two windows
+            match = _WHITESPACE_RE.search(text, end)
+            end = match.start() if match else length
+        count += len(text[start:end].split())
+        start = end
+    return count
+
 
 class DocumentStorageOperations:
     """
@@ -67,11 +104,13 @@ class DocumentStorageOperations:
         storage_service = self.doc_storage_service
 
         source_word_counts = {original_source_id: 0}
-        url_to_full_document = {}
+        url_to_full_document: dict[str, str] = {}
         processed_docs = 0
         prepared_documents: list[dict[str, str]] = []
         source_summary_contents: list[str] = []
         source_summary_metadatas: list[dict[str, Any]] = []
+        # URL -> index into prepared_documents and the source summary lists
+        seen_urls: dict[str, int] = {}
 
         # Prepare documents for storage and source metadata
         for doc_index, doc in enumerate(crawl_results):
@@ -96,10 +135,27 @@ class DocumentStorageOperations:
                 logger.debug(f"Skipping document {doc_index}: empty {'URL' if not doc_url else 'content'}")
                 continue
 
+            # A repeated URL would be chunked, embedded and stored twice; keep its longest body
+            seen_index = seen_urls.get(doc_url)
+            if seen_index is not None:
+                if len(markdown_content) > len(prepared_documents[seen_index]["markdown"]):
+                    source_word_count = _count_words(markdown_content)
+                    source_word_counts[original_source_id] += (
+                        source_word_count - source_summary_metadatas[seen_index]["word_count"]
+                    )
+                    url_to_full_document[doc_url] = markdown_content
+                    prepared_documents[seen_index]["markdown"] = markdown_content
+                    source_summary_contents[seen_index] = markdown_content
+                    source_summary_metadatas[seen_index]["word_count"] = source_word_count
+                logger.debug(f"Skipping document {doc_index}: duplicate URL {doc_url}")
+                continue
+            seen_urls[doc_url] = len(prepared_documents)
+
             # Increment processed document count
             processed_docs += 1
 
-            # Store full document for code extraction context
+            # Store full document for code extraction context. The same str object backs
+            # prepared_documents and every chunk's URL, so bodies and URLs are held once.
             url_to_full_document[doc_url] = markdown_content
 
             prepared_documents.append(
@@ -111,11 +167,11 @@ class DocumentStorageOperations:
                 }
             )
 
-            source_word_count = len(markdown_content.split())
-            source_word_counts[original_source_id] = source_word_counts.get(original_source_id, 0) + source_word_count
+            source_word_count = _count_words(markdown_content)
+            source_word_counts[original_source_id] += source_word_count
 
-            # Keep summary inputs bounded to avoid retaining large intermediate text in memory.
-            source_summary_contents.append(markdown_content[:5000])
+            # The body itself, not a copy; _create_source_records reads only its leading chars
+            source_summary_contents.append(markdown_content)
             source_summary_metadatas.append(
                 {
                     "source_id": original_source_id,
@@ -160,8 +216,12 @@ class DocumentStorageOperations:
 
         chunk_count = 0
         chunks_stored = 0
+        # Shared by every chunk's metadata rather than looked up per chunk
+        knowledge_type = request.get("knowledge_type", "documentation")
+        tags = request.get("tags", [])
 
-        if is_llms_full and url_to_full_document:
+        chunk_llms_sections = is_llms_full and bool(url_to_full_document)
+        if chunk_llms_sections:
             # Handle llms-full.txt with section-based pages
             base_url = next(iter(url_to_full_document.keys()))
             content = url_to_full_document[base_url]
@@ -175,52 +235,48 @@ class DocumentStorageOperations:
                 crawl_type="llms_full",
             )
 
-            # Parse sections and re-chunk each section
+            # Parse sections; each is chunked separately below
             from .helpers.llms_full_parser import parse_llms_full_sections
 
             sections = parse_llms_full_sections(content, base_url)
 
-            all_urls = []
-            all_chunk_numbers = []
-            all_contents = []
-            all_metadatas = []
             url_to_full_document.clear()
-
-            # Chunk each section separately
             for section in sections:
-                # Update url_to_full_document with section content
                 url_to_full_document[section.url] = section.content
-                section_chunks = await storage_service.smart_chunk_text_async(
-                    section.content, chunk_size=5000
-                )
-
-                for i, chunk in enumerate(section_chunks):
-                    all_urls.append(section.url)
-                    all_chunk_numbers.append(i)
-                    all_contents.append(chunk)
+        else:
+            url_to_page_id = await page_storage_ops.store_pages(
+                prepared_documents,
+                original_source_id,
+                request,
+                crawl_type,
+            )
 
-                    word_count = len(chunk.split())
-                    metadata = {
-                        "url": section.url,
-                        "title": section.section_title,
-                        "description": "",
-                        "source_id": original_source_id,
-                        "knowledge_type": request.get("knowledge_type", "documentation"),
-                        "page_id": url_to_page_id.get(section.url),
-                        "crawl_type": "llms_full",
-                        "word_count": word_count,
-                        "char_count": len(chunk),
-                        "chunk_index": i,
-                        "tags": request.get("tags", []),
-                    }
-                    all_metadatas.append(metadata)
+        try:
+            rag_settings = await credential_service.get_credentials_by_category("rag_strategy")
+            raw_flush_size = int(rag_settings.get("DOCUMENT_STORAGE_FLUSH_CHUNKS", "250"))
+            flush_chunk_size = max(25, raw_flush_size)
+        except Exception as e:
+            logger.warning(f"Failed to load DOCUMENT_STORAGE_FLUSH_CHUNKS setting: {e}")
+            flush_chunk_size = 250
+
+        pending_urls: list[str] = []
+        pending_chunk_numbers: list[int] = []
+        pending_contents: list[str] = []
+        pending_metadatas: list[dict[str, Any]] = []
+        delete_done = False
+        deletion_urls = list(url_to_full_document.keys())
+
+        async def flush_pending_chunks() -> None:
+            nonlocal delete_done, chunks_stored
+            if not pending_contents:
+                return
 
             storage_stats = await add_documents_to_supabase(
                 client=self.supabase_client,
-                urls=all_urls,
-                chunk_numbers=all_chunk_numbers,
-                contents=all_contents,
-                metadatas=all_metadatas,
+                urls=pending_urls,
+                chunk_numbers=pending_chunk_numbers,
+                contents=pending_contents,
+                metadatas=pending_metadatas,
                 url_to_full_document=url_to_full_document,
                 batch_size=25,
                 progress_callback=progress_callback,
@@ -228,62 +284,66 @@ class DocumentStorageOperations:
                 provider=None,
                 cancellation_check=cancellation_check,
                 url_to_page_id=url_to_page_id,
+                delete_existing_records=not delete_done,
+                deletion_urls=deletion_urls if not delete_done else None,
             )
-            chunk_count = len(all_contents)
-            chunks_stored = storage_stats.get("chunks_stored", 0)
-        else:
-            url_to_page_id = await page_storage_ops.store_pages(
-                prepared_documents,
-                original_source_id,
-                request,
-                crawl_type,
-            )
-
-            try:
-                rag_settings = await credential_service.get_credentials_by_category("rag_strategy")
-                raw_flush_size = int(rag_settings.get("DOCUMENT_STORAGE_FLUSH_CHUNKS", "250"))
-                flush_chunk_size = max(25, raw_flush_size)
-            except Exception as e:
-                logger.warning(f"Failed to load DOCUMENT_STORAGE_FLUSH_CHUNKS setting: {e}")
-                flush_chunk_size = 250
-
-            pending_urls: list[str] = []
-            pending_chunk_numbers: list[int] = []
-            pending_contents: list[str] = []
-            pending_metadatas: list[dict[str, Any]] = []
-            delete_done = False
-            deletion_urls = list(url_to_full_document.keys())
-
-            async def flush_pending_chunks() -> None:
-                nonlocal delete_done, chunks_stored
-                if not pending_contents:
-                    return
-
-                storage_stats = await add_documents_to_supabase(
-                    client=self.supabase_client,
-                    urls=pending_urls,
-                    chunk_numbers=pending_chunk_numbers,
-                    contents=pending_contents,
-                    metadatas=pending_metadatas,
-                    url_to_full_document=url_to_full_document,
-                    batch_size=25,
-                    progress_callback=progress_callback,
-                    enable_parallel_batches=True,
-                    provider=None,
-                    cancellation_check=cancellation_check,
-                    url_to_page_id=url_to_page_id,
-                    delete_existing_records=not delete_done,
-                    deletion_urls=deletion_urls if not delete_done else None,
+            chunks_stored += storage_stats.get("chunks_stored", 0)
+            delete_done = True
+
+            pending_urls.clear()
+            pending_chunk_numbers.clear()
+            pending_contents.clear()
+            pending_metadatas.clear()
+            await asyncio.sleep(0)
+
+        if chunk_llms_sections:
+            # Sections are chunked in order and flushed incrementally, like crawled pages.
+            # Consecutive sections are grouped so each group is one thread-pool submission.
+            async def chunk_section_group(group: list) -> None:
+                nonlocal chunk_count
+
+                group_chunks = await storage_service.smart_chunk_texts_async(
+                    [section.content for section in group], chunk_size=5000
                 )
-                chunks_stored += storage_stats.get("chunks_stored", 0)
-                delete_done = True
+                for section, section_chunks in zip(group, group_chunks, strict=True):
+                    metadata_template = {
+                        "url": section.url,
+                        "title": section.section_title,
+                        "description": "",
+                        "source_id": original_source_id,
+                        "knowledge_type": knowledge_type,
+                        "page_id": url_to_page_id.get(section.url),
+                        "crawl_type": "llms_full",
+                        "tags": tags,
+                    }
+                    for i, chunk in enumerate(section_chunks):
+                        pending_urls.append(section.url)
+                        pending_chunk_numbers.append(i)
+                        pending_contents.append(chunk)
 
-                pending_urls.clear()
-                pending_chunk_numbers.clear()
-                pending_contents.clear()
-                pending_metadatas.clear()
-                await asyncio.sleep(0)
+                        metadata = metadata_template.copy()
+                        metadata["word_count"] = _count_words(chunk)
+                        metadata["char_count"] = len(chunk)
+                        metadata["chunk_index"] = i
+                        pending_metadatas.append(metadata)
+                        chunk_count += 1
+
+                        if len(pending_contents) >= flush_chunk_size:
+                            await flush_pending_chunks()
 
+            section_group: list = []
+            section_group_chars = 0
+            for section in sections:
+                section_group.append(section)
+                section_group_chars += len(section.content)
+                if section_group_chars >= _LLMS_SECTION_GROUP_CHARS:
+                    await chunk_section_group(section_group)
+                    section_group = []
+                    section_group_chars = 0
+            if section_group:
+                await chunk_section_group(section_group)
+        else:
+            # Documents are chunked one at a time into the pending buffers
             for doc_index, doc in enumerate(prepared_documents):
                 if cancellation_check:
                     try:
@@ -298,19 +358,34 @@ class DocumentStorageOperations:
                         raise
 
                 doc_url = doc["url"]
-                markdown_content = doc["markdown"]
                 text_batches = storage_service.split_text_for_incremental_chunking(
-                    markdown_content,
+                    doc["markdown"],
                     max_chars_per_batch=200_000,
                     pdf_pages_per_batch=75,
                 )
 
+                # Per-document invariants, bound once outside the chunk loop. Each chunk's
+                # metadata is a copy of the template (a flat copy is cheaper than a literal).
+                metadata_template = {
+                    "url": doc_url,
+                    "title": doc.get("title", ""),
+                    "description": doc.get("description", ""),
+                    "source_id": original_source_id,
+                    "knowledge_type": knowledge_type,
+                    "page_id": url_to_page_id.get(doc_url),
+                    "crawl_type": crawl_type,
+                    "tags": tags,
+                }
+
                 doc_chunk_index = 0
+                # Chunks left before the next cancellation check (every 10th chunk, from the first)
+                cancel_countdown = 0
                 for text_batch in text_batches:
-                    chunks = await storage_service.smart_chunk_text_async(text_batch, chunk_size=5000)
-
-                    for chunk in chunks:
-                        if cancellation_check and doc_chunk_index % 10 == 0:
+                    async for chunk in storage_service.smart_chunk_text_iter_async(text_batch, chunk_size=5000):
+                        if cancel_countdown:
+                            cancel_countdown -= 1
+                        elif cancellation_check:
+                            cancel_countdown = 9
                             try:
                                 cancellation_check()
                             except asyncio.CancelledError:
@@ -322,35 +397,26 @@ class DocumentStorageOperations:
                                     )
                                 raise
 
-                        word_count = len(chunk.split())
                         pending_urls.append(doc_url)
                         pending_chunk_numbers.append(doc_chunk_index)
                         pending_contents.append(chunk)
-                        pending_metadatas.append(
-                            {
-                                "url": doc_url,
-                                "title": doc.get("title", ""),
-                                "description": doc.get("description", ""),
-                                "source_id": original_source_id,
-                                "knowledge_type": request.get("knowledge_type", "documentation"),
-                                "page_id": url_to_page_id.get(doc_url),
-                                "crawl_type": crawl_type,
-                                "word_count": word_count,
-                                "char_count": len(chunk),
-                                "chunk_index": doc_chunk_index,
-                                "tags": request.get("tags", []),
-                            }
-                        )
-                        chunk_count += 1
+                        metadata = metadata_template.copy()
+                        metadata["word_count"] = _count_words(chunk)
+                        metadata["char_count"] = len(chunk)
+                        metadata["chunk_index"] = doc_chunk_index
+                        pending_metadatas.append(metadata)
                         doc_chunk_index += 1
+                        chunk_count += 1
 
+                        # Flush mid-document so memory is bounded by the flush size, not the document
                         if len(pending_contents) >= flush_chunk_size:
                             await flush_pending_chunks()
 
+                # Yield control after processing each document
                 if doc_index > 0 and doc_index % 5 == 0:
                     await asyncio.sleep(0)
 
-            await flush_pending_chunks()
+        await flush_pending_chunks()
         safe_logfire_info(f"url_to_full_document keys: {list(url_to_full_document.keys())[:5]}")
 
         avg_chunks = (chunk_count / processed_docs) if processed_docs > 0 else 0.0
@@ -380,55 +446,55 @@ class DocumentStorageOperations:
 
         Args:
             all_metadatas: List of metadata for all chunks
-            all_contents: List of all chunk contents
+            all_contents: List of all chunk contents (only the leading 5000 chars of each are used)
             source_word_counts: Word counts per source_id
             request: Original crawl request
         """
-        # Find ALL unique source_ids in the crawl results
-        unique_source_ids = set()
-        source_id_contents = {}
-        source_id_word_counts = {}
+        # Group content and word counts by source_id in a single pass
+        source_id_contents: defaultdict[str, list[str]] = defaultdict(list)
+        source_id_word_counts: defaultdict[str, int] = defaultdict(int)
 
-        for i, metadata in enumerate(all_metadatas):
+        for metadata, content in zip(all_metadatas, all_contents, strict=True):
             source_id = metadata["source_id"]
-            unique_source_ids.add(source_id)
-
-            # Group content by source_id for better summaries
-            if source_id not in source_id_contents:
-                source_id_contents[source_id] = []
-            source_id_contents[source_id].append(all_contents[i])
+            source_id_contents[source_id].append(content)
+            source_id_word_counts[source_id] += metadata.get("word_count", 0)
 
-            # Track word counts per source_id
-            if source_id not in source_id_word_counts:
-                source_id_word_counts[source_id] = 0
-            source_id_word_counts[source_id] += metadata.get('word_count', 0)
+        unique_source_ids = source_id_contents.keys()
 
         safe_logfire_info(
             f"Found {len(unique_source_ids)} unique source_ids: {list(unique_source_ids)}"
         )
 
-        # Create source records for ALL unique source_ids
+        # Combined content per source_id, built before any summary is dispatched
+        combined_contents: dict[str, str] = {}
         for source_id in unique_source_ids:
-            # Get combined content for this specific source_id
-            source_contents = source_id_contents[source_id]
             combined_content = ""
-            for chunk in source_contents[:3]:  # First 3 chunks for this source
+            for content in source_id_contents[source_id][:3]:  # First 3 chunks for this source
+                chunk = content[:_SOURCE_SUMMARY_CONTENT_CHARS]
                 if len(combined_content) + len(chunk) < 15000:
                     combined_content += " " + chunk
                 else:
                     break
+            combined_contents[source_id] = combined_content
 
-            # Generate summary with fallback
-            try:
-                # Call async extract_source_summary directly
-                summary = await extract_source_summary(source_id, combined_content)
-            except Exception as e:
-                logger.error(f"Failed to generate AI summary for '{source_id}'", exc_info=True)
-                safe_logfire_error(
-                    f"Failed to generate AI summary for '{source_id}': {str(e)}, using fallback"
-                )
-                # Fallback to simple summary
-                summary = f"Documentation from {source_id} - {len(source_contents)} pages crawled"
+        # Summaries are independent LLM round trips; run them concurrently, bounded
+        summary_semaphore = asyncio.Semaphore(_SOURCE_SUMMARY_CONCURRENCY)
+
+        async def summarize(source_id: str) -> tuple[str, str]:
+            async with summary_semaphore:
+                try:
+                    return source_id, await extract_source_summary(source_id, combined_contents[source_id])
+                except Exception as e:
+                    logger.error(f"Failed to generate AI summary for '{source_id}'", exc_info=True)
+                    safe_logfire_error(
+                        f"Failed to generate AI summary for '{source_id}': {str(e)}, using fallback"
+                    )
+                    # Fallback to simple summary
+                    page_count = len(source_id_contents[source_id])
+                    return source_id, f"Documentation from {source_id} - {page_count} pages crawled"
+
+        async def store_source(source_id: str, summary: str) -> None:
+            combined_content = combined_contents[source_id]
 
             # Update source info in database BEFORE storing documents
             safe_logfire_info(
@@ -489,25 +555,27 @@ class DocumentStorageOperations:
                         f"Unable to create source record for '{source_id}'. This will cause foreign key violations."
                     ) from fallback_error
 
+        summaries = await asyncio.gather(*(summarize(source_id) for source_id in unique_source_ids))
+        await asyncio.gather(*(store_source(source_id, summary) for source_id, summary in summaries))
+
         # Verify ALL source records exist before proceeding with document storage
         if unique_source_ids:
-            for source_id in unique_source_ids:
-                try:
-                    source_check = (
-                        self.supabase_client.table("archon_sources")
-                        .select("source_id")
-                        .eq("source_id", source_id)
-                        .execute()
+            try:
+                source_check = (
+                    self.supabase_client.table("archon_sources")
+                    .select("source_id")
+                    .in_("source_id", list(unique_source_ids))
+                    .execute()
+                )
+                missing_source_ids = unique_source_ids - {row["source_id"] for row in source_check.data or []}
+                if missing_source_ids:
+                    raise Exception(
+                        f"Source record verification failed - {sorted(missing_source_ids)} do not exist in sources table"
                     )
-                    if not source_check.data:
-                        raise Exception(
-                            f"Source record verification failed - '{source_id}' does not exist in sources table"
-                        )
-                    safe_logfire_info(f"Source record verified for '{source_id}'")
-                except Exception as e:
-                    logger.error(f"Source verification failed for '{source_id}'", exc_info=True)
-                    safe_logfire_error(f"Source verification failed for '{source_id}': {str(e)}")
-                    raise
+            except Exception as e:
+                logger.error("Source verification failed", exc_info=True)
+                safe_logfire_error(f"Source verification failed for {list(unique_source_ids)}: {str(e)}")
+                raise
 
             safe_logfire_info(
                 f"All {len(unique_source_ids)} source records verified - proceeding with document storage"
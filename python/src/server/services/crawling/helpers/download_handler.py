@@ -5,10 +5,13 @@ Provides fallback support for downloadable document URLs (e.g. endpoints that
 trigger file downloads instead of returning HTML).
 """
 
+import asyncio
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
-import requests
+import httpx
 
 from ....config.logfire_config import get_logger
 from ....utils.document_processing import extract_text_from_document
@@ -16,8 +19,37 @@ from .url_handler import URLHandler
 
 logger = get_logger(__name__)
 
+# Downloads larger than this are abandoned rather than buffered in memory
+_MAX_DOWNLOAD_BYTES = 256 * 1024 * 1024
+_DOWNLOAD_BLOCK_SIZE = 64 * 1024
 
-def try_extract_downloadable_document(url: str, timeout: int = 45) -> dict[str, Any] | None:
+# PDFs at least this large are parsed in a worker process; smaller ones are not worth the IPC
+_PROCESS_EXTRACTION_MIN_BYTES = 1024 * 1024
+
+_pdf_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Return the shared PDF extraction process pool, creating it on first use."""
+    global _pdf_pool
+    if _pdf_pool is None:
+        # spawn: the server process runs threads, which fork would copy mid-state
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=max(2, (os.cpu_count() or 2) // 2),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pdf_pool
+
+
+def shutdown_pdf_pool() -> None:
+    """Shut down the PDF extraction process pool if it was started."""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+async def try_extract_downloadable_document(url: str, timeout: int = 45) -> dict[str, Any] | None:
     """
     Try to download and extract text from a document URL.
 
@@ -31,41 +63,67 @@ def try_extract_downloadable_document(url: str, timeout: int = 45) -> dict[str,
     headers = {
         "User-Agent": "ArchonCrawler/1.0",
         "Accept": "application/pdf,application/octet-stream,text/plain,*/*",
+        # PDFs are already compressed; skip transfer encoding and its decompression
+        "Accept-Encoding": "identity",
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
-        response.raise_for_status()
+        async with (
+            httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client,
+            client.stream("GET", url, headers=headers) as response,
+        ):
+            response.raise_for_status()
+
+            # Decide from the headers before any of the body is read
+            content_type = (response.headers.get("content-type") or "").split(";")[0].strip().lower()
+            content_disposition = (response.headers.get("content-disposition") or "").lower()
+
+            final_url = str(response.url) or url
+            inferred_name = URLHandler.infer_filename_from_url(final_url)
+
+            is_pdf = (
+                content_type == "application/pdf"
+                or inferred_name.lower().endswith(".pdf")
+                or final_url.lower().endswith(".pdf")
+                or ".pdf" in content_disposition
+            )
+
+            if not is_pdf:
+                logger.debug(
+                    f"Download fallback skipped non-PDF content | url={url} | final_url={final_url} | content_type={content_type}"
+                )
+                return None
+
+            declared_length = response.headers.get("content-length")
+            if declared_length and declared_length.isdigit() and int(declared_length) > _MAX_DOWNLOAD_BYTES:
+                logger.warning(
+                    f"Download fallback skipped {declared_length}-byte body over {_MAX_DOWNLOAD_BYTES} | url={url}"
+                )
+                return None
+
+            buffer = bytearray()
+            async for block in response.aiter_bytes(_DOWNLOAD_BLOCK_SIZE):
+                buffer.extend(block)
+                if len(buffer) > _MAX_DOWNLOAD_BYTES:
+                    logger.warning(
+                        f"Download fallback exceeded {_MAX_DOWNLOAD_BYTES} bytes, skipping | url={url}"
+                    )
+                    return None
+            body = bytes(buffer)
     except Exception as exc:
         logger.warning(f"Download fallback failed for {url}: {exc}")
         return None
 
-    content_type = (response.headers.get("content-type") or "").split(";")[0].strip().lower()
-    content_disposition = (response.headers.get("content-disposition") or "").lower()
-
-    final_url = response.url or url
-    inferred_name = URLHandler.infer_filename_from_url(final_url)
-
-    is_pdf = (
-        content_type == "application/pdf"
-        or inferred_name.lower().endswith(".pdf")
-        or final_url.lower().endswith(".pdf")
-        or ".pdf" in content_disposition
-    )
-
-    if not is_pdf:
-        logger.debug(
-            f"Download fallback skipped non-PDF content | url={url} | final_url={final_url} | content_type={content_type}"
-        )
-        return None
-
-    body = response.content
     if not body:
         logger.warning(f"Download fallback returned empty body | url={url}")
         return None
 
     try:
-        extracted_text = extract_text_from_document(body, inferred_name, content_type or "application/pdf")
+        # Parsing holds the GIL for seconds on large PDFs; give those their own process
+        executor = _get_pdf_pool() if len(body) >= _PROCESS_EXTRACTION_MIN_BYTES else None
+        extracted_text = await asyncio.get_running_loop().run_in_executor(
+            executor, extract_text_from_document, body, inferred_name, content_type or "application/pdf"
+        )
     except Exception as exc:
         logger.warning(f"Failed to extract downloaded PDF text for {url}: {exc}")
         return None
@@ -287,10 +287,7 @@ class BatchCrawlStrategy:
                     )
 
                     if should_try_download_fallback:
-                        download_fallback_result = await asyncio.to_thread(
-                            try_extract_downloadable_document,
-                            original_url,
-                        )
+                        download_fallback_result = await try_extract_downloadable_document(original_url)
 
                     if download_fallback_result:
                         successful_results.append(download_fallback_result)
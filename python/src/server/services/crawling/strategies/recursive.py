@@ -338,10 +338,7 @@ class RecursiveCrawlStrategy:
                         )
 
                         if should_try_download_fallback:
-                            download_fallback_result = await asyncio.to_thread(
-                                try_extract_downloadable_document,
-                                original_url,
-                            )
+                            download_fallback_result = await try_extract_downloadable_document(original_url)
 
                         if download_fallback_result:
                             if result_callback:
@@ -5,6 +5,7 @@ Handles loading, storing, and accessing credentials with encryption for sensitiv
 Credentials include API keys, service credentials, and application configuration.
 """
 
+import asyncio
 import base64
 import os
 import time
@@ -48,6 +49,7 @@ class CredentialService:
         self._rag_settings_cache: dict[str, Any] | None = None
         self._rag_cache_timestamp: float | None = None
         self._rag_cache_ttl = 300  # 5 minutes TTL for RAG settings cache
+        self._rag_settings_refresh: asyncio.Future[dict[str, Any]] | None = None
 
     def _get_supabase_client(self) -> DatabaseClient:
         """Get the active database client (Supabase or standalone PostgreSQL)."""
@@ -218,6 +220,7 @@ class CredentialService:
             if category == "rag_strategy":
                 self._rag_settings_cache = None
                 self._rag_cache_timestamp = None
+                self._rag_settings_refresh = None
                 logger.debug(f"Invalidated RAG settings cache due to update of {key}")
 
                 # Also invalidate provider service cache to ensure immediate effect
@@ -268,6 +271,7 @@ class CredentialService:
             if self._rag_settings_cache is not None and key in self._rag_settings_cache:
                 self._rag_settings_cache = None
                 self._rag_cache_timestamp = None
+                self._rag_settings_refresh = None
                 logger.debug(f"Invalidated RAG settings cache due to deletion of {key}")
 
                 # Also invalidate provider service cache to ensure immediate effect
@@ -304,49 +308,63 @@ class CredentialService:
         if not self._cache_initialized:
             await self.load_all_credentials()
 
-        # Special caching for rag_strategy category to reduce database calls
-        if category == "rag_strategy":
-            current_time = time.time()
-
-            # Check if we have valid cached data
-            if (
-                self._rag_settings_cache is not None
-                and self._rag_cache_timestamp is not None
-                and current_time - self._rag_cache_timestamp < self._rag_cache_ttl
-            ):
-                logger.debug("Using cached RAG settings")
-                return self._rag_settings_cache
-
         try:
-            supabase = self._get_supabase_client()
-            result = (
-                supabase.table("archon_settings").select("*").eq("category", category).execute()
-            )
-
-            credentials = {}
-            for item in result.data:
-                key = item["key"]
-                if item["is_encrypted"]:
-                    credentials[key] = {
-                        "value": "[ENCRYPTED]",
-                        "is_encrypted": True,
-                        "description": item["description"],
-                    }
-                else:
-                    credentials[key] = item["value"]
-
-            # Cache rag_strategy results
+            # Special caching for rag_strategy category to reduce database calls
             if category == "rag_strategy":
-                self._rag_settings_cache = credentials
-                self._rag_cache_timestamp = time.time()
-                logger.debug(f"Cached RAG settings with {len(credentials)} items")
-
-            return credentials
+                current_time = time.time()
+
+                # Check if we have valid cached data
+                if (
+                    self._rag_settings_cache is not None
+                    and self._rag_cache_timestamp is not None
+                    and current_time - self._rag_cache_timestamp < self._rag_cache_ttl
+                ):
+                    logger.debug("Using cached RAG settings")
+                    return self._rag_settings_cache
+
+                # Concurrent misses (e.g. overlapping crawls) share one in-flight query
+                refresh = self._rag_settings_refresh
+                if refresh is None or refresh.done() or refresh.get_loop() is not asyncio.get_running_loop():
+                    refresh = asyncio.ensure_future(self._refresh_rag_settings())
+                    self._rag_settings_refresh = refresh
+                return await asyncio.shield(refresh)
+
+            return await self._query_category(category)
 
         except Exception as e:
             logger.error(f"Error getting credentials for category {category}: {e}")
             return {}
 
+    async def _refresh_rag_settings(self) -> dict[str, Any]:
+        """Query rag_strategy settings and cache them unless invalidated meanwhile."""
+        credentials = await self._query_category("rag_strategy")
+
+        if self._rag_settings_refresh is asyncio.current_task():
+            self._rag_settings_cache = credentials
+            self._rag_cache_timestamp = time.time()
+            logger.debug(f"Cached RAG settings with {len(credentials)} items")
+
+        return credentials
+
+    async def _query_category(self, category: str) -> dict[str, Any]:
+        """Query all settings in a category, masking encrypted values."""
+        supabase = self._get_supabase_client()
+        result = await supabase.table("archon_settings").select("*").eq("category", category).aexecute()
+
+        credentials = {}
+        for item in result.data:
+            key = item["key"]
+            if item["is_encrypted"]:
+                credentials[key] = {
+                    "value": "[ENCRYPTED]",
+                    "is_encrypted": True,
+                    "description": item["description"],
+                }
+            else:
+                credentials[key] = item["value"]
+
+        return credentials
+
     async def list_all_credentials(self) -> list[CredentialItem]:
         """Get all credentials as a list of CredentialItem objects (for Settings UI)."""
         try:
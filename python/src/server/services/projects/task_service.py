@@ -105,13 +105,14 @@ class TaskService:
                 if existing_tasks_response.data:
                     logger.info(f"Reordering {len(existing_tasks_response.data)} existing tasks")
 
-                    # Increment task_order for all affected tasks
-                    for existing_task in existing_tasks_response.data:
-                        new_order = existing_task["task_order"] + 1
-                        self.supabase_client.table("archon_tasks").update({
-                            "task_order": new_order,
-                            "updated_at": datetime.now().isoformat(),
-                        }).eq("id", existing_task["id"]).execute()
+                    # Increment task_order for all affected tasks in a single transaction
+                    with self.supabase_client.transaction() as tx:
+                        for existing_task in existing_tasks_response.data:
+                            new_order = existing_task["task_order"] + 1
+                            tx.table("archon_tasks").update({
+                                "task_order": new_order,
+                                "updated_at": datetime.now().isoformat(),
+                            }).eq("id", existing_task["id"]).execute()
 
             task_data = {
                 "project_id": project_id,
@@ -60,21 +60,19 @@ class BaseSearchStrategy:
                     rpc_params["filter"] = {}
 
                 # Execute search
-                response = self.supabase_client.rpc(table_rpc, rpc_params).execute()
+                response = await self.supabase_client.rpc(table_rpc, rpc_params).aexecute(stream=True)
 
                 # Filter by similarity threshold
                 filtered_results = []
-                if response.data:
-                    for result in response.data:
-                        similarity = float(result.get("similarity", 0.0))
-                        if similarity >= SIMILARITY_THRESHOLD:
-                            filtered_results.append(result)
+                total_results = 0
+                for result in response.iter_data():
+                    total_results += 1
+                    similarity = float(result.get("similarity", 0.0))
+                    if similarity >= SIMILARITY_THRESHOLD:
+                        filtered_results.append(result)
 
                 span.set_attribute("results_found", len(filtered_results))
-                span.set_attribute(
-                    "results_filtered",
-                    len(response.data) - len(filtered_results) if response.data else 0,
-                )
+                span.set_attribute("results_filtered", total_results - len(filtered_results))
 
                 return filtered_results
 
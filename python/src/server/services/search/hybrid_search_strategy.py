@@ -54,7 +54,7 @@ class HybridSearchStrategy:
                 source_filter = filter_json.pop("source", None) if "source" in filter_json else None
 
                 # Call the hybrid search PostgreSQL function
-                response = self.supabase_client.rpc(
+                response = await self.supabase_client.rpc(
                     "hybrid_search_archon_crawled_pages",
                     {
                         "query_embedding": query_embedding,
@@ -63,15 +63,11 @@ class HybridSearchStrategy:
                         "filter": filter_json,
                         "source_filter": source_filter,
                     },
-                ).execute()
-
-                if not response.data:
-                    logger.debug("No results from hybrid search")
-                    return []
+                ).aexecute(stream=True)
 
                 # Format results to match expected structure
                 results = []
-                for row in response.data:
+                for row in response.iter_data():
                     result = {
                         "id": row["id"],
                         "url": row["url"],
@@ -84,6 +80,10 @@ class HybridSearchStrategy:
                     }
                     results.append(result)
 
+                if not results:
+                    logger.debug("No results from hybrid search")
+                    return []
+
                 span.set_attribute("results_count", len(results))
 
                 # Log match type distribution for debugging
@@ -141,7 +141,7 @@ class HybridSearchStrategy:
                     final_source_filter = filter_json.pop("source")
 
                 # Call the hybrid search PostgreSQL function
-                response = self.supabase_client.rpc(
+                response = await self.supabase_client.rpc(
                     "hybrid_search_archon_code_examples",
                     {
                         "query_embedding": query_embedding,
@@ -150,15 +150,11 @@ class HybridSearchStrategy:
                         "filter": filter_json,
                         "source_filter": final_source_filter,
                     },
-                ).execute()
-
-                if not response.data:
-                    logger.debug("No results from hybrid code search")
-                    return []
+                ).aexecute(stream=True)
 
                 # Format results to match expected structure
                 results = []
-                for row in response.data:
+                for row in response.iter_data():
                     result = {
                         "id": row["id"],
                         "url": row["url"],
@@ -172,6 +168,10 @@ class HybridSearchStrategy:
                     }
                     results.append(result)
 
+                if not results:
+                    logger.debug("No results from hybrid code search")
+                    return []
+
                 span.set_attribute("results_count", len(results))
 
                 # Log match type distribution for debugging
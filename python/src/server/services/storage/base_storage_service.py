@@ -8,9 +8,12 @@ Provides common functionality for all document storage operations including:
 - Progress reporting
 """
 
+import asyncio
+import itertools
 import re
 from abc import ABC, abstractmethod
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable, Iterator
+from functools import lru_cache
 from typing import Any
 from urllib.parse import urlparse
 
@@ -18,6 +21,59 @@ from ...config.logfire_config import get_logger, safe_span
 
 logger = get_logger(__name__)
 
+_HEADER_RE = re.compile(r"^(#+)\s+(.+)$", re.MULTILINE)
+_PAGE_MARKER_RE = re.compile(r"(?m)^--- Page \d+ ---\n?")
+_NON_WHITESPACE_RE = re.compile(r"\S")
+# Texts (or groups of texts) longer than this are chunked in the CPU thread pool
+_THREAD_CHUNKING_MIN_CHARS = 50_000
+# Pending progress updates kept by batch_process_with_progress; the oldest is dropped when full
+_PROGRESS_QUEUE_SIZE = 8
+# Headers beyond this many are left out of chunk metadata
+_MAX_METADATA_HEADERS = 32
+
+
+@lru_cache(maxsize=4096)
+def _parse_source_id(url: str) -> str:
+    """Source ID for a URL; cached because documents of one crawl share a few hosts."""
+    # Plain ASCII scheme://host URLs are sliced directly; anything urlparse could treat
+    # differently (non-ASCII hosts, bracketed hosts, tabs or newlines, unusual schemes) goes through it.
+    scheme_end = url.find("://")
+    if scheme_end > 0 and url.isascii() and url[:scheme_end].isalpha():
+        host_start = scheme_end + 3
+        host_end = len(url)
+        for separator in "/?#":
+            separator_pos = url.find(separator, host_start, host_end)
+            if separator_pos != -1:
+                host_end = separator_pos
+        if host_end > host_start and not any(char in url for char in "[]\t\r\n"):
+            return url[host_start:host_end]
+
+    try:
+        parsed_url = urlparse(url)
+        return parsed_url.netloc or parsed_url.path or url
+    except Exception as e:
+        logger.warning(f"Error parsing URL {url}: {e}")
+        return url
+
+
+def _strip_bounds(text: str, start: int, end: int) -> tuple[int, int]:
+    """Bounds of text[start:end].strip() within text."""
+    if start < end and text[start].isspace():
+        # Leading whitespace runs can be long (blank PDF pages); skip them in C
+        match = _NON_WHITESPACE_RE.search(text, start, end)
+        if match is None:
+            return end, end
+        start = match.start()
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _slice_stripped(text: str, start: int, end: int) -> str:
+    """Return text[start:end].strip() without first copying the unstripped slice."""
+    start, end = _strip_bounds(text, start, end)
+    return text[start:end]
+
 
 class BaseStorageService(ABC):
     """Base class for all storage services with common functionality."""
@@ -53,13 +109,56 @@ class BaseStorageService(ABC):
         Returns:
             List of text chunks
         """
+        return list(self.iter_smart_chunks(text, chunk_size))
+
+    def iter_smart_chunks(self, text: str, chunk_size: int = 5000) -> Iterator[str]:
+        """
+        Yield the chunks of smart_chunk_text one at a time.
+
+        Only the chunk being built is held, so callers can consume a large text
+        without materializing its full chunk list.
+
+        Args:
+            text: Text to chunk
+            chunk_size: Maximum chunk size (default: 5000)
+
+        Yields:
+            Text chunks, in order
+        """
         if not text or not isinstance(text, str):
             logger.warning("Invalid text provided for chunking")
-            return []
-
-        chunks = []
+            return
+
+        # Text that fits in one chunk needs neither boundary search nor merging
+        if len(text) <= chunk_size:
+            stripped = text.strip()
+            if stripped:
+                yield stripped
+            return
+
+        # Consecutive small chunks (<200 chars) are combined with the chunks after them.
+        # Parts are joined once per merged chunk so long merge runs are not re-copied.
+        parts: list[str] = []
+        merged_length = 0
+        for chunk in self._iter_raw_chunks(text, chunk_size):
+            if merged_length >= 200:
+                yield "\n\n".join(parts)
+                parts = []
+                merged_length = 0
+            elif parts:
+                merged_length += 2
+            parts.append(chunk)
+            merged_length += len(chunk)
+
+        if parts:
+            yield "\n\n".join(parts)
+
+    @staticmethod
+    def _iter_raw_chunks(text: str, chunk_size: int) -> Iterator[str]:
+        """Yield stripped, non-empty chunks of up to chunk_size characters, cut at the best break before the limit."""
         start = 0
         text_length = len(text)
+        min_break = chunk_size * 0.3
 
         while start < text_length:
             # Determine the end of this chunk
@@ -69,56 +168,35 @@ class BaseStorageService(ABC):
             if end >= text_length:
                 chunk = text[start:].strip()
                 if chunk:
-                    chunks.append(chunk)
+                    yield chunk
                 break
 
-            # Try to find a good break point
-            chunk = text[start:end]
+            # Find each separator with text.rfind bounded to [start, end) rather
+            # than slicing the candidate chunk out of text first.
 
             # First, try to break at a code block boundary
-            code_block_pos = chunk.rfind("```")
-            if code_block_pos != -1 and code_block_pos > chunk_size * 0.3:
+            code_block_pos = text.rfind("```", start, end) - start
+            if code_block_pos > min_break:
                 end = start + code_block_pos
 
             # If no code block, try paragraph break
-            elif "\n\n" in chunk:
-                last_break = chunk.rfind("\n\n")
-                if last_break > chunk_size * 0.3:
-                    end = start + last_break
+            elif (last_break := text.rfind("\n\n", start, end)) != -1:
+                if last_break - start > min_break:
+                    end = last_break
 
             # If no paragraph break, try sentence break
-            elif ". " in chunk:
-                last_period = chunk.rfind(". ")
-                if last_period > chunk_size * 0.3:
-                    end = start + last_period + 1
+            elif (last_period := text.rfind(". ", start, end)) != -1:
+                if last_period - start > min_break:
+                    end = last_period + 1
 
             # Extract chunk and clean it up
             chunk = text[start:end].strip()
             if chunk:
-                chunks.append(chunk)
+                yield chunk
 
             # Move start position for next chunk
             start = end
 
-        # Combine consecutive small chunks (<200 chars) together
-        if chunks:
-            combined_chunks: list[str] = []
-            i = 0
-            while i < len(chunks):
-                current = chunks[i]
-
-                # Keep combining while current is small and there are more chunks
-                while len(current) < 200 and i + 1 < len(chunks):
-                    i += 1
-                    current = current + "\n\n" + chunks[i]
-
-                combined_chunks.append(current)
-                i += 1
-
-            chunks = combined_chunks
-
-        return chunks
-
     async def smart_chunk_text_async(
         self, text: str, chunk_size: int = 5000, progress_callback: Callable | None = None
     ) -> list[str]:
@@ -138,7 +216,7 @@ class BaseStorageService(ABC):
         ) as span:
             try:
                 # For large texts, run chunking in thread pool
-                if len(text) > 50000:  # 50KB threshold
+                if len(text) > _THREAD_CHUNKING_MIN_CHARS:
                     chunks = await self.threading_service.run_cpu_intensive(
                         self.smart_chunk_text, text, chunk_size
                     )
@@ -163,6 +241,50 @@ class BaseStorageService(ABC):
                 logger.error(f"Error chunking text: {e}")
                 raise
 
+    async def smart_chunk_texts_async(self, texts: list[str], chunk_size: int = 5000) -> list[list[str]]:
+        """
+        Chunk several texts with one thread-pool submission.
+
+        Groups of small texts that are large in total are chunked off the event loop
+        together, paying the pool hand-off once instead of once per text.
+
+        Args:
+            texts: Texts to chunk
+            chunk_size: Maximum chunk size
+
+        Returns:
+            The chunks of each text, in the order of texts
+        """
+        if sum(map(len, texts)) > _THREAD_CHUNKING_MIN_CHARS:
+            chunked: list[list[str]] = await self.threading_service.run_cpu_intensive(
+                self._chunk_texts, texts, chunk_size
+            )
+            return chunked
+        return self._chunk_texts(texts, chunk_size)
+
+    def _chunk_texts(self, texts: list[str], chunk_size: int) -> list[list[str]]:
+        return [self.smart_chunk_text(text, chunk_size) for text in texts]
+
+    async def smart_chunk_text_iter_async(self, text: str, chunk_size: int = 5000) -> AsyncIterator[str]:
+        """
+        Async generator over the chunks of smart_chunk_text.
+
+        Control returns to the event loop every 16 chunks so that other tasks
+        (e.g. in-flight storage of earlier chunks) progress while a large text
+        is being chunked.
+
+        Args:
+            text: Text to chunk
+            chunk_size: Maximum chunk size
+
+        Yields:
+            Text chunks, in order
+        """
+        for index, chunk in enumerate(self.iter_smart_chunks(text, chunk_size), 1):
+            yield chunk
+            if index % 16 == 0:
+                await asyncio.sleep(0)
+
     def split_text_for_incremental_chunking(
         self,
         text: str,
@@ -190,38 +312,39 @@ class BaseStorageService(ABC):
         max_chars_per_batch = max(10_000, int(max_chars_per_batch))
         pdf_pages_per_batch = max(1, int(pdf_pages_per_batch))
 
-        page_marker_pattern = re.compile(r"(?m)^--- Page \d+ ---\n?")
-        page_markers = list(page_marker_pattern.finditer(text))
+        # The substring test rules out marker-free text far faster than the anchored regex scan
+        page_markers = list(_PAGE_MARKER_RE.finditer(text)) if "--- Page " in text else []
 
         if page_markers:
-            page_sections: list[str] = []
+            # Pages are tracked as (start, end) offsets into text; each page is copied
+            # only when its batch is joined.
+            page_sections: list[tuple[int, int]] = []
             for i, marker in enumerate(page_markers):
-                start = marker.start()
                 end = page_markers[i + 1].start() if i + 1 < len(page_markers) else len(text)
-                section = text[start:end].strip()
-                if section:
-                    page_sections.append(section)
+                section_start, section_end = _strip_bounds(text, marker.start(), end)
+                if section_end > section_start:
+                    page_sections.append((section_start, section_end))
 
             batched_texts: list[str] = []
-            current_batch: list[str] = []
+            current_batch: list[tuple[int, int]] = []
             current_chars = 0
 
-            for page_index, page_section in enumerate(page_sections):
-                page_chars = len(page_section)
+            for page_index, (section_start, section_end) in enumerate(page_sections):
+                page_chars = section_end - section_start
                 reached_page_limit = len(current_batch) >= pdf_pages_per_batch
                 reached_char_limit = current_batch and (current_chars + page_chars) > max_chars_per_batch
 
                 if reached_page_limit or reached_char_limit:
-                    batched_texts.append("\n\n".join(current_batch))
+                    batched_texts.append("\n\n".join(text[s:e] for s, e in current_batch))
                     current_batch = []
                     current_chars = 0
 
-                current_batch.append(page_section)
+                current_batch.append((section_start, section_end))
                 current_chars += page_chars
 
                 is_last_page = page_index == len(page_sections) - 1
                 if is_last_page and current_batch:
-                    batched_texts.append("\n\n".join(current_batch))
+                    batched_texts.append("\n\n".join(text[s:e] for s, e in current_batch))
 
             return batched_texts
 
@@ -233,12 +356,12 @@ class BaseStorageService(ABC):
             end = min(start + max_chars_per_batch, text_length)
 
             if end < text_length:
-                window = text[start:end]
-                paragraph_break = window.rfind("\n\n")
+                # rfind bounded to [start, end) avoids copying the candidate batch
+                paragraph_break = text.rfind("\n\n", start, end) - start
                 if paragraph_break > max_chars_per_batch * 0.6:
                     end = start + paragraph_break
 
-            section = text[start:end].strip()
+            section = _slice_stripped(text, start, end)
             if section:
                 batched_texts.append(section)
 
@@ -262,9 +385,9 @@ class BaseStorageService(ABC):
         Returns:
             Dictionary containing metadata
         """
-        # Extract headers
-        headers = re.findall(r"^(#+)\s+(.+)$", chunk, re.MULTILINE)
-        header_str = "; ".join([f"{h[0]} {h[1]}" for h in headers]) if headers else ""
+        # Extract headers; matching stops after the cap so header-dense chunks stay cheap
+        headers = itertools.islice(_HEADER_RE.finditer(chunk), _MAX_METADATA_HEADERS)
+        header_str = "; ".join([f"{h[1]} {h[2]}" for h in headers])
 
         # Extract basic stats
         metadata = {
@@ -292,12 +415,7 @@ class BaseStorageService(ABC):
         Returns:
             Source ID (typically the domain)
         """
-        try:
-            parsed_url = urlparse(url)
-            return parsed_url.netloc or parsed_url.path or url
-        except Exception as e:
-            logger.warning(f"Error parsing URL {url}: {e}")
-            return url
+        return _parse_source_id(url)
 
     async def batch_process_with_progress(
         self,
@@ -306,39 +424,78 @@ class BaseStorageService(ABC):
         batch_size: int = 20,
         progress_callback: Callable | None = None,
         description: str = "Processing",
+        concurrency: int = 1,
     ) -> list[Any]:
         """
         Process items in batches with progress reporting.
 
+        Batches run one at a time unless ``concurrency`` allows more in flight;
+        results keep the order of ``items``. Progress is reported as each batch completes through a
+        bounded queue drained by a separate task, so a slow callback never holds
+        up dispatch; when the callback falls behind, the oldest updates are dropped.
+
         Args:
             items: Items to process
             process_func: Function to process each batch
             batch_size: Size of each batch
             progress_callback: Optional progress callback
             description: Description for progress messages
+            concurrency: Maximum number of batches processed concurrently (default: 1)
 
         Returns:
             List of processed results
         """
-        results = []
         total_items = len(items)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
 
-        for i in range(0, total_items, batch_size):
-            batch_end = min(i + batch_size, total_items)
-            batch = items[i:batch_end]
+        async def run_batch(index: int, batch: list[Any]) -> tuple[int, int, list[Any]]:
+            async with semaphore:
+                return index, len(batch), await process_func(batch)
 
-            # Process batch
-            batch_results = await process_func(batch)
-            results.extend(batch_results)
+        progress_queue: asyncio.Queue[tuple[str, int] | None] = asyncio.Queue(maxsize=_PROGRESS_QUEUE_SIZE)
 
-            # Report progress
-            if progress_callback:
-                progress_pct = int((batch_end / total_items) * 100)
-                await progress_callback(
-                    f"{description}: {batch_end}/{total_items} items", progress_pct
-                )
+        def report(update: tuple[str, int] | None) -> None:
+            if progress_queue.full():
+                progress_queue.get_nowait()
+            progress_queue.put_nowait(update)
+
+        async def pump_progress(callback: Callable) -> None:
+            # None marks the end of processing
+            while (update := await progress_queue.get()) is not None:
+                await callback(*update)
 
-        return results
+        pump = asyncio.create_task(pump_progress(progress_callback)) if progress_callback else None
+        tasks = [
+            asyncio.create_task(run_batch(index, items[start : start + batch_size]))
+            for index, start in enumerate(range(0, total_items, batch_size))
+        ]
+        batch_results: list[list[Any]] = [[] for _ in tasks]
+        completed_items = 0
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, batch_length, results = await next_done
+                batch_results[index] = results
+                completed_items += batch_length
+
+                # Report progress
+                if pump:
+                    progress_pct = int((completed_items / total_items) * 100)
+                    report((f"{description}: {completed_items}/{total_items} items", progress_pct))
+
+            if pump:
+                report(None)
+                await pump
+        finally:
+            pending: list[asyncio.Task[Any]] = [task for task in tasks if not task.done()]
+            if pump and not pump.done():
+                pending.append(pump)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        return [result for results in batch_results for result in results]
 
     @abstractmethod
     async def store_documents(self, documents: list[dict[str, Any]], **kwargs) -> dict[str, Any]:
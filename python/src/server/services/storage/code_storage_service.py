@@ -1344,7 +1344,7 @@ async def add_code_examples_to_supabase(
 
         for retry in range(max_retries):
             try:
-                client.table("archon_code_examples").insert(batch_data).execute()
+                client.table("archon_code_examples").insert(batch_data, returning="minimal").execute()
                 # Success - break out of retry loop
                 break
             except Exception as e:
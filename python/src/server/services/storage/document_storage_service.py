@@ -443,7 +443,10 @@ async def add_documents_to_supabase(
                         raise
 
                 try:
-                    client.table("archon_crawled_pages").insert(batch_data).execute()
+                    # Re-crawlable data: skip waiting on the WAL flush for each batch commit
+                    client.table("archon_crawled_pages").insert(
+                        batch_data, returning="minimal", synchronous=False
+                    ).execute()
                     total_chunks_stored += len(batch_data)
 
                     # Increment completed batches and report simple progress
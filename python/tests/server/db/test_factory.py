@@ -0,0 +1,44 @@
+"""Unit tests for the DatabaseClient factory."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.server.db import factory
+
+
+@pytest.fixture(autouse=True)
+def _reset_client():
+    factory.reset_db_client()
+    yield
+    factory.reset_db_client()
+
+
+def test_concurrent_first_calls_build_one_client():
+    built = []
+
+    def slow_build():
+        time.sleep(0.05)
+        client = MagicMock()
+        built.append(client)
+        return client
+
+    results = []
+    with patch.object(factory, "_build_client", side_effect=slow_build):
+        threads = [threading.Thread(target=lambda: results.append(factory.get_db_client())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert len(built) == 1
+    assert all(r is built[0] for r in results)
+
+
+def test_unknown_provider_fails_fast(monkeypatch):
+    monkeypatch.setenv("DB_PROVIDER", "mysql")
+
+    with pytest.raises(ValueError, match="DB_PROVIDER='mysql' is not supported"):
+        factory.get_db_client()
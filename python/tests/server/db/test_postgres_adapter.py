@@ -0,0 +1,569 @@
+"""Unit tests for the psycopg2-backed PostgreSQL adapter."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, call, patch
+
+import psycopg2.errors
+import psycopg2.extensions
+import psycopg2.extras
+import psycopg2.pool
+import pytest
+
+from src.server.db.postgres_adapter import (
+    PostgresDatabaseClient,
+    PostgresRpcQueryBuilder,
+    PostgresTableQueryBuilder,
+    _build_where,
+    _ConnectionPool,
+    _Filter,
+    _LeasedConnections,
+    _parse_or_filter,
+    _StatementCache,
+    _to_positional,
+)
+from src.server.db.protocol import APIResponse
+
+
+def _mock_cursor():
+    cur = MagicMock()
+    cur.connection = MagicMock()
+    return cur
+
+
+class TestToPositional:
+    """Tests for %s -> $n placeholder translation."""
+
+    def test_numbers_placeholders_in_order(self):
+        sql = 'SELECT * FROM t WHERE "a" = %s AND "b" >= %s'
+        assert _to_positional(sql) == 'SELECT * FROM t WHERE "a" = $1 AND "b" >= $2'
+
+    def test_unescapes_literal_percent(self):
+        assert _to_positional("SELECT '100%%' WHERE x = %s") == "SELECT '100%' WHERE x = $1"
+
+
+class TestBuildWhere:
+    """Tests for WHERE clause construction from filters."""
+
+    def test_filters_are_and_joined_with_adapted_params(self):
+        sql, params = _build_where([
+            _Filter("eq", "source_id", "s1"),
+            _Filter("gte", "chunk_number", 2),
+            _Filter("ilike", "title", "%doc%"),
+            _Filter("contains", "metadata", {"k": "v"}),
+        ])
+
+        assert sql == (
+            'WHERE "source_id" = %s AND "chunk_number" >= %s AND "title" ILIKE %s AND "metadata" @> %s::jsonb'
+        )
+        assert params[:3] == ["s1", 2, "%doc%"]
+        assert isinstance(params[3], psycopg2.extras.Json)
+
+    def test_json_params_serialize_with_orjson(self):
+        _, params = _build_where([_Filter("contains", "metadata", {1: "a", "k": [1.5]})])
+
+        assert params[0].dumps(params[0].adapted) == '{"1":"a","k":[1.5]}'
+
+    def test_invalid_column_is_rejected(self):
+        with pytest.raises(ValueError, match="Invalid SQL identifier"):
+            _build_where([_Filter("eq", "bad; DROP", 1)])
+
+    def test_same_shape_reuses_sql_text(self):
+        first, first_params = _build_where([_Filter("eq", "source_id", "s1"), _Filter("in", "id", [1, 2])])
+        second, second_params = _build_where([_Filter("eq", "source_id", "s2"), _Filter("in", "id", [3, 4, 5])])
+
+        assert first is second
+        assert first_params == ["s1", [1, 2]]
+        assert second_params == ["s2", [3, 4, 5]]
+
+    def test_in_filter_binds_a_single_array_parameter(self):
+        short_sql, short_params = _build_where([_Filter("in", "source_id", ["a"])])
+        long_sql, long_params = _build_where([_Filter("in", "source_id", ["a", "b", "c"])])
+
+        assert short_sql == long_sql == 'WHERE "source_id" = ANY(%s)'
+        assert short_params == [["a"]]
+        assert long_params == [["a", "b", "c"]]
+
+    def test_empty_or_filter_produces_no_where(self):
+        assert _build_where([_Filter("or", "", "")]) == ("", [])
+
+
+class TestParseOrFilter:
+    """Tests for PostgREST-style OR filter parsing."""
+
+    def test_values_are_parameterized(self):
+        sql, params = _parse_or_filter("title.ilike.%foo%,summary.eq.bar")
+        assert sql == '"title" ILIKE %s OR "summary" = %s'
+        assert params == ["%foo%", "bar"]
+
+    def test_null_checks_take_no_params(self):
+        sql, params = _parse_or_filter("archived.is.null,archived.is.false")
+        assert sql == '"archived" IS NULL OR "archived" IS FALSE'
+        assert params == []
+
+
+class TestStatementCache:
+    """Tests for the per-connection prepared statement cache."""
+
+    def test_prepares_once_then_executes(self):
+        cache = _StatementCache(max_size=4)
+        cur = _mock_cursor()
+
+        cache.execute(cur, "SELECT * FROM t WHERE a = %s", [1])
+        cache.execute(cur, "SELECT * FROM t WHERE a = %s", [2])
+
+        statements = [c.args[0] for c in cur.execute.call_args_list]
+        assert sum(s.startswith("PREPARE") for s in statements) == 1
+        assert statements[0].endswith("AS SELECT * FROM t WHERE a = $1")
+        assert cur.execute.call_args_list[-1].args[1] == [2]
+
+    def test_evicts_least_recently_used(self):
+        cache = _StatementCache(max_size=1)
+        cur = _mock_cursor()
+
+        cache.execute(cur, "SELECT 1", [])
+        cache.execute(cur, "SELECT 2", [])
+
+        statements = [c.args[0] for c in cur.execute.call_args_list]
+        assert any(s.startswith("DEALLOCATE") for s in statements)
+
+    def test_connections_do_not_share_statements(self):
+        cache = _StatementCache(max_size=4)
+        first, second = _mock_cursor(), _mock_cursor()
+
+        cache.execute(first, "SELECT 1", [])
+        cache.execute(second, "SELECT 1", [])
+
+        assert first.execute.call_args_list[0].args[0].startswith("PREPARE")
+        assert second.execute.call_args_list[0].args[0].startswith("PREPARE")
+
+    def test_disabled_cache_executes_directly(self):
+        cache = _StatementCache(max_size=0)
+        cur = _mock_cursor()
+
+        cache.execute(cur, "SELECT * FROM t WHERE a = %s", [1])
+
+        cur.execute.assert_called_once_with("SELECT * FROM t WHERE a = %s", [1])
+
+    def test_only_plan_invalidation_errors_are_stale(self):
+        assert _StatementCache.is_stale(psycopg2.errors.InvalidSqlStatementName("prepared statement does not exist"))
+        assert _StatementCache.is_stale(
+            psycopg2.errors.FeatureNotSupported("cached plan must not change result type")
+        )
+        assert not _StatementCache.is_stale(psycopg2.errors.FeatureNotSupported("unsupported"))
+        assert not _StatementCache.is_stale(psycopg2.errors.UniqueViolation("duplicate key"))
+
+    @pytest.mark.parametrize(
+        ("error", "deallocated"),
+        [
+            (psycopg2.errors.FeatureNotSupported("cached plan must not change result type"), True),
+            (psycopg2.errors.UniqueViolation("duplicate key"), False),
+        ],
+    )
+    def test_failed_execute_resets_only_stale_statements(self, error, deallocated):
+        cache = _StatementCache(max_size=4)
+        conn = MagicMock(autocommit=True, closed=0)
+        cur = conn.cursor.return_value
+        cur.connection = conn
+        cur.description = None
+        connections = MagicMock()
+        connections.acquire.return_value = conn
+        builder = PostgresRpcQueryBuilder(connections, "match_rows", {}, cache)
+        builder.execute()
+        cur.execute.side_effect = error
+
+        with pytest.raises(type(error)):
+            builder.execute()
+
+        reset = conn.cursor.return_value.__enter__.return_value.execute
+        assert (call("DEALLOCATE ALL") in reset.call_args_list) is deallocated
+
+
+class TestInsertExecution:
+    """Tests for INSERT/UPSERT batching through execute_values."""
+
+    def _builder(self, table="archon_sources"):
+        return PostgresTableQueryBuilder(MagicMock(), table, _StatementCache(max_size=0))
+
+    def test_insert_uses_single_values_marker(self):
+        builder = self._builder().insert([{"a": 1}, {"a": 2}])
+        assert builder._build_insert_sql(["a"]) == 'INSERT INTO "archon_sources" ("a") VALUES %s RETURNING *'
+
+    def test_upsert_appends_conflict_clause(self):
+        builder = self._builder().upsert([{"source_id": "s1", "title": "t"}])
+        sql = builder._build_insert_sql(["source_id", "title"])
+        assert sql == (
+            'INSERT INTO "archon_sources" ("source_id", "title") VALUES %s'
+            ' ON CONFLICT ("source_id") DO UPDATE SET "title" = EXCLUDED."title" RETURNING *'
+        )
+
+    def test_select_quotes_identifiers_and_rejects_expressions(self):
+        sql, _ = self._builder().select("id, source_id").order("created_at", desc=True)._build_sql()
+        assert sql == 'SELECT "id", "source_id" FROM "archon_sources" ORDER BY "created_at" DESC'
+
+        for expression in ("count(*)", "id; DROP TABLE x", "metadata->'k'", "kind:"):
+            with pytest.raises(ValueError, match="Invalid SQL identifier"):
+                self._builder().select(expression)._build_sql()
+
+    def test_select_renders_json_paths_and_aliases(self):
+        sql, _ = self._builder().select("metadata->knowledge_type, kind:metadata->>tags->0, label:title")._build_sql()
+        assert sql == (
+            'SELECT "metadata"->\'knowledge_type\' AS "knowledge_type",'
+            ' "metadata"->>\'tags\'->0 AS "kind", "title" AS "label" FROM "archon_sources"'
+        )
+
+    async def test_storage_statistics_reads_json_path_column(self):
+        from src.server.services.knowledge.database_metrics_service import DatabaseMetricsService
+
+        conn = MagicMock(autocommit=True)
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.description = [("knowledge_type",)]
+        # Knowledge types, then (no) recent sources
+        cur.fetchall.side_effect = [[("technical",), ("technical",), ("business",)], []]
+        connections = MagicMock()
+        connections.acquire.return_value = conn
+        client = MagicMock()
+        client.table.side_effect = lambda name: PostgresTableQueryBuilder(
+            connections, name, _StatementCache(max_size=0)
+        )
+
+        stats = await DatabaseMetricsService(client).get_storage_statistics()
+
+        assert stats["knowledge_type_distribution"] == {"technical": 2, "business": 1}
+        assert cur.execute.call_args_list[0].args[0] == (
+            'SELECT "metadata"->\'knowledge_type\' AS "knowledge_type" FROM "archon_sources"'
+        )
+
+    def test_range_binds_int_limit_and_offset(self):
+        sql, params = self._builder().select("id").eq("a", 1).order("id").range("10", 19)._build_sql()
+        assert sql == 'SELECT "id" FROM "archon_sources" WHERE "a" = %s ORDER BY "id" ASC LIMIT %s OFFSET %s'
+        assert params == [1, 10, 10]
+
+        next_sql, next_params = self._builder().select("id").eq("a", 1).order("id").range(20, 29)._build_sql()
+        assert next_sql is sql
+        assert next_params == [1, 10, 20]
+
+    def test_rows_are_passed_as_adapted_tuples(self):
+        builder = self._builder().insert([{"a": 1, "meta": {"k": "v"}}])
+        cur = MagicMock(description=[("a",), ("meta",)])
+        with patch("psycopg2.extras.execute_values", return_value=[(1, {"k": "v"})]) as execute_values:
+            assert builder._execute_insert(cur) == [{"a": 1, "meta": {"k": "v"}}]
+
+        values = execute_values.call_args.args[2]
+        assert values[0][0] == 1
+        assert isinstance(values[0][1], psycopg2.extras.Json)
+        assert execute_values.call_args.kwargs["fetch"] is True
+
+    def test_empty_insert_skips_round_trip(self):
+        builder = self._builder().insert([])
+        cur = MagicMock()
+        assert builder._execute_insert(cur) == []
+        cur.execute.assert_not_called()
+
+    def test_large_minimal_insert_streams_through_copy(self):
+        rows = [{"a": i, "b": None, "meta": {"i": i, "s": "x\\y\n"}} for i in range(60)]
+        rows[1]["b"] = "tab\tand\\N"
+        builder = self._builder().insert(rows, returning="minimal")
+        cur = MagicMock()
+
+        assert builder._execute_insert(cur) == []
+
+        sql, buf = cur.copy_expert.call_args.args
+        assert sql == 'COPY "archon_sources" ("a", "b", "meta") FROM STDIN'
+        lines = buf.getvalue().split("\n")
+        assert lines[0] == '0\t\\N\t{"i":0,"s":"x\\\\\\\\y\\\\n"}'
+        assert lines[1].split("\t")[1] == "tab\\tand\\\\N"
+        assert len(lines) == 61 and lines[-1] == ""
+
+    def test_small_minimal_insert_drops_returning(self):
+        builder = self._builder().insert([{"a": 1}], returning="minimal")
+        cur = MagicMock()
+        with patch("psycopg2.extras.execute_values", return_value=None) as execute_values:
+            assert builder._execute_insert(cur) == []
+
+        assert execute_values.call_args.args[1] == 'INSERT INTO "archon_sources" ("a") VALUES %s'
+        assert execute_values.call_args.kwargs["fetch"] is False
+
+
+class TestTransaction:
+    """Tests for grouping statements into one transaction."""
+
+    def _client(self):
+        with patch("src.server.db.postgres_adapter._ConnectionPool") as pool_cls:
+            client = PostgresDatabaseClient("postgresql://test", statement_cache_size=0)
+        conn = MagicMock(autocommit=True, closed=0)
+        pool_cls.return_value.getconn.return_value = conn
+        return client, pool_cls.return_value, conn
+
+    def test_commits_once_and_reuses_connection(self):
+        client, pool, conn = self._client()
+
+        with client.transaction() as tx:
+            assert conn.autocommit is False
+            tx.table("archon_tasks").update({"task_order": 1}).eq("id", "a").execute()
+            tx.table("archon_tasks").update({"task_order": 2}).eq("id", "b").execute()
+
+        pool.getconn.assert_called_once()
+        conn.commit.assert_called_once()
+        conn.rollback.assert_not_called()
+        assert conn.autocommit is True
+
+    def test_rolls_back_when_block_raises(self):
+        client, pool, conn = self._client()
+
+        with pytest.raises(RuntimeError), client.transaction():
+            raise RuntimeError("boom")
+
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+        assert conn.autocommit is True
+
+    def test_asynchronous_commit_is_scoped_to_the_transaction(self):
+        client, _, conn = self._client()
+        cur = conn.cursor.return_value.__enter__.return_value
+
+        with client.transaction(synchronous=False):
+            pass
+
+        cur.execute.assert_called_once_with("SET LOCAL synchronous_commit = off")
+        conn.commit.assert_called_once()
+
+    def test_nested_transaction_is_rejected(self):
+        client, _, _ = self._client()
+
+        with client.transaction(), pytest.raises(RuntimeError, match="Nested"):
+            with client.transaction():
+                pass
+
+
+class TestConnectionLeasing:
+    """Tests for per-statement connection checkout."""
+
+    def _leases(self, max_conn=2):
+        pool = MagicMock()
+        pool.getconn.side_effect = lambda: MagicMock(autocommit=False, closed=0)
+        return _LeasedConnections(pool, max_conn=max_conn), pool
+
+    def test_pool_registers_vector_types_on_every_new_connection(self):
+        conns = [MagicMock(), MagicMock()]
+        pool = _ConnectionPool.__new__(_ConnectionPool)
+        with patch.object(psycopg2.pool.ThreadedConnectionPool, "_connect", side_effect=conns), patch(
+            "pgvector.psycopg2.register_vector"
+        ) as register_vector:
+            opened = [pool._connect(), pool._connect()]
+
+        assert opened == conns
+        assert [c.args[0] for c in register_vector.call_args_list] == conns
+        for conn in conns:
+            conn.rollback.assert_called_once()
+
+    def test_pool_keeps_returned_connections_open_up_to_max_conn(self):
+        conns = [MagicMock(closed=0) for _ in range(3)]
+        for conn in conns:
+            conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        with patch("psycopg2.connect", side_effect=conns), patch("pgvector.psycopg2.register_vector"):
+            pool = _ConnectionPool(1, 3, dsn="postgresql://test")
+            leased = [pool.getconn() for _ in range(3)]
+            for conn in leased:
+                pool.putconn(conn)
+
+        assert sorted(map(id, pool._pool)) == sorted(map(id, conns))
+        for conn in conns:
+            conn.close.assert_not_called()
+
+    def test_connection_is_returned_after_each_statement(self):
+        leases, pool = self._leases()
+
+        conn = leases.acquire()
+        assert conn.autocommit is True
+        leases.release(conn)
+
+        pool.putconn.assert_called_once_with(conn, close=False)
+
+    def test_transaction_keeps_the_thread_on_one_connection(self):
+        leases, pool = self._leases()
+
+        conn = leases.begin()
+        assert conn.autocommit is False
+        assert leases.acquire() is conn
+        leases.release(conn)
+        pool.putconn.assert_not_called()
+
+        leases.end(conn)
+        assert conn.autocommit is True
+        pool.putconn.assert_called_once_with(conn, close=False)
+
+    def test_asynchronous_commit_is_switched_only_when_the_mode_changes(self):
+        leases, pool = self._leases()
+        conn = MagicMock(autocommit=True, closed=0)
+        pool.getconn.side_effect = None
+        pool.getconn.return_value = conn
+        cur = conn.cursor.return_value.__enter__.return_value
+
+        for synchronous in (False, False, True, True):
+            leases.release(leases.acquire(synchronous))
+        leases.end(leases.begin())
+
+        assert [c.args[0] for c in cur.execute.call_args_list] == [
+            "SET synchronous_commit = off",
+            "RESET synchronous_commit",
+        ]
+
+    def test_asynchronous_insert_requests_asynchronous_commit(self):
+        connections = MagicMock()
+        builder = PostgresTableQueryBuilder(connections, "archon_crawled_pages", _StatementCache(max_size=0))
+        with patch.object(PostgresTableQueryBuilder, "_execute_insert", return_value=[]):
+            builder.insert([{"a": 1}], returning="minimal", synchronous=False).execute()
+
+        connections.acquire.assert_called_once_with(False)
+
+    def test_closed_connection_is_replaced(self):
+        leases, pool = self._leases()
+        stale = MagicMock(autocommit=True, closed=2)
+        fresh = MagicMock(autocommit=True, closed=0)
+        pool.getconn.side_effect = [stale, fresh]
+
+        assert leases.acquire() is fresh
+        pool.putconn.assert_called_once_with(stale, close=True)
+
+    def test_more_threads_than_connections_wait_for_a_free_one(self):
+        leases, pool = self._leases(max_conn=2)
+        lock = threading.Lock()
+        in_use = 0
+        peak = 0
+        errors = []
+
+        def run_statement():
+            nonlocal in_use, peak
+            try:
+                conn = leases.acquire()
+                with lock:
+                    in_use += 1
+                    peak = max(peak, in_use)
+                time.sleep(0.01)
+                with lock:
+                    in_use -= 1
+                leases.release(conn)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run_statement) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert peak == 2
+        assert pool.putconn.call_count == 8
+
+    def test_exhausted_pool_fails_after_the_checkout_timeout(self):
+        leases, _ = self._leases(max_conn=1)
+        leases.acquire()
+
+        with patch("src.server.db.postgres_adapter._CHECKOUT_TIMEOUT", 0.01), pytest.raises(
+            RuntimeError, match="pool exhausted"
+        ):
+            leases.acquire()
+
+
+class TestRpcStreaming:
+    """Tests for lazily iterated RPC results."""
+
+    def test_stream_yields_rows_and_closes_cursor(self):
+        conn = MagicMock(autocommit=True)
+        cur = conn.cursor.return_value
+        cur.description = [("i",)]
+        cur.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+        connections = MagicMock()
+        connections.acquire.return_value = conn
+        builder = PostgresRpcQueryBuilder(connections, "match_rows", {"n": 3}, _StatementCache(max_size=0))
+
+        response = builder.execute(stream=True)
+
+        assert response.data is None
+        cur.close.assert_not_called()
+        connections.release.assert_not_called()
+        assert [r["i"] for r in response.iter_data()] == [1, 2, 3]
+        cur.close.assert_called_once()
+        connections.release.assert_called_once_with(conn)
+
+    def test_closing_a_partly_read_stream_returns_the_connection(self):
+        conn = MagicMock(autocommit=True)
+        cur = conn.cursor.return_value
+        cur.description = [("i",)]
+        cur.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+        connections = MagicMock()
+        connections.acquire.return_value = conn
+        builder = PostgresRpcQueryBuilder(connections, "match_rows", {}, _StatementCache(max_size=0))
+
+        rows = builder.execute(stream=True).iter_data()
+        assert next(rows) == {"i": 1}
+        rows.close()
+        rows.close()
+
+        cur.close.assert_called_once()
+        connections.release.assert_called_once_with(conn)
+
+    def test_stream_reads_all_rows_while_the_pool_holds_an_idle_connection(self):
+        def fake_conn(batches):
+            conn = MagicMock(closed=0, autocommit=False)
+            conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+            conn.close.side_effect = lambda: setattr(conn, "closed", 1)
+            pending = iter(batches)
+
+            def fetchmany(size):
+                if conn.closed:
+                    raise psycopg2.InterfaceError("cursor already closed")
+                return next(pending, [])
+
+            cur = conn.cursor.return_value
+            cur.description = [("i",)]
+            cur.fetchmany.side_effect = fetchmany
+            return conn
+
+        idle, streamed = fake_conn([]), fake_conn([[(1,), (2,)], [(3,)]])
+        with patch("psycopg2.connect", side_effect=[idle, streamed]), patch("pgvector.psycopg2.register_vector"):
+            client = PostgresDatabaseClient("postgresql://test", min_conn=1, max_conn=2, statement_cache_size=0)
+            held = client._connections.acquire()
+            # Another thread hands its connection back while the RPC runs, so the
+            # pool holds an idle connection when the stream's lease would return
+            streamed.cursor.return_value.execute.side_effect = lambda *args: client._connections.release(held)
+            response = client.rpc("match_rows", {}).execute(stream=True)
+
+            assert [r["i"] for r in response.iter_data()] == [1, 2, 3]
+
+        assert client._pool._used == {}
+        client.close()
+
+    def test_iter_data_walks_materialized_data(self):
+        assert list(APIResponse(data=[{"a": 1}]).iter_data()) == [{"a": 1}]
+        assert list(APIResponse(data={"a": 1}).iter_data()) == [{"a": 1}]
+        assert list(APIResponse().iter_data()) == []
+
+
+class TestAsyncExecution:
+    """Tests for awaiting queries off the event loop thread."""
+
+    async def test_aexecute_runs_on_the_client_executor(self):
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="test-pg")
+        table = PostgresTableQueryBuilder(MagicMock(), "archon_sources", _StatementCache(max_size=0), executor)
+        rpc = PostgresRpcQueryBuilder(MagicMock(), "match", {}, _StatementCache(max_size=0), executor)
+
+        def table_execute(self):
+            return threading.current_thread().name
+
+        def rpc_execute(self, *, stream):
+            return stream, threading.current_thread().name
+
+        with patch.object(PostgresTableQueryBuilder, "execute", table_execute), patch.object(
+            PostgresRpcQueryBuilder, "execute", rpc_execute
+        ):
+            table_thread = await table.aexecute()
+            stream, rpc_thread = await rpc.aexecute(stream=True)
+        executor.shutdown()
+
+        assert table_thread.startswith("test-pg")
+        assert rpc_thread.startswith("test-pg")
+        assert stream is True
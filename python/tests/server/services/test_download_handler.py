@@ -0,0 +1,91 @@
+"""Tests for the downloadable-document fallback."""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.server.services.crawling.helpers import download_handler
+from src.server.services.crawling.helpers.download_handler import try_extract_downloadable_document
+
+
+class _RecordingStream(httpx.AsyncByteStream):
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self.read = False
+
+    async def __aiter__(self):
+        self.read = True
+        for block in self.blocks:
+            yield block
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Route the handler's AsyncClient to a canned response and return its body stream."""
+    async_client = httpx.AsyncClient
+
+    def install(headers, blocks):
+        stream = _RecordingStream(blocks)
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, headers=headers, stream=stream))
+        monkeypatch.setattr(
+            download_handler.httpx, "AsyncClient", lambda **kwargs: async_client(transport=transport, **kwargs)
+        )
+        return stream
+
+    return install
+
+
+async def test_non_pdf_body_is_never_read(serve):
+    stream = serve({"content-type": "text/html"}, [b"<html>"])
+
+    assert await try_extract_downloadable_document("https://example.com/page.html") is None
+    assert not stream.read
+
+
+async def test_pdf_body_is_streamed_to_extraction(serve):
+    serve({"content-type": "application/pdf"}, [b"%PDF-", b"1.7"])
+
+    with patch.object(download_handler, "extract_text_from_document", return_value="Text") as extract:
+        result = await try_extract_downloadable_document("https://example.com/file.pdf")
+
+    assert result["markdown"] == "Text"
+    assert result["download_url"] == "https://example.com/file.pdf"
+    assert extract.call_args.args[0] == b"%PDF-1.7"
+
+
+async def test_oversized_download_is_abandoned(serve, monkeypatch):
+    monkeypatch.setattr(download_handler, "_MAX_DOWNLOAD_BYTES", 8)
+    serve({"content-type": "application/pdf"}, [b"%PDF-", b"1.7 more"])
+
+    with patch.object(download_handler, "extract_text_from_document") as extract:
+        assert await try_extract_downloadable_document("https://example.com/file.pdf") is None
+
+    extract.assert_not_called()
+
+
+async def test_declared_length_over_cap_skips_body(serve, monkeypatch):
+    monkeypatch.setattr(download_handler, "_MAX_DOWNLOAD_BYTES", 8)
+    stream = serve({"content-type": "application/pdf", "content-length": "9"}, [b"%PDF-1.7!"])
+
+    assert await try_extract_downloadable_document("https://example.com/file.pdf") is None
+    assert not stream.read
+
+
+async def test_large_pdf_is_parsed_in_the_process_pool(serve, monkeypatch):
+    monkeypatch.setattr(download_handler, "_PROCESS_EXTRACTION_MIN_BYTES", 8)
+    serve({"content-type": "application/pdf"}, [b"%PDF-1.7 large"])
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(download_handler, "_get_pdf_pool", lambda: pool)
+    try:
+        with patch.object(pool, "submit", wraps=pool.submit) as submit, patch.object(
+            download_handler, "extract_text_from_document", return_value="Text"
+        ):
+            result = await try_extract_downloadable_document("https://example.com/file.pdf")
+    finally:
+        pool.shutdown()
+
+    assert result["markdown"] == "Text"
+    submit.assert_called_once()
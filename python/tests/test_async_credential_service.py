@@ -336,3 +336,34 @@ class TestAsyncCredentialService:
         result2 = await get_credential("PERSISTENT_KEY", "default")
         assert result2 == "persistent_value"
         assert result1 == result2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_rag_settings_misses_share_one_query(self, mock_supabase_client):
+        """Test that overlapping rag_strategy lookups issue a single database query"""
+        mock_client, mock_table = mock_supabase_client
+        queries = 0
+
+        async def slow_query():
+            nonlocal queries
+            queries += 1
+            await asyncio.sleep(0.01)
+            return MagicMock(data=[{"key": "USE_HYBRID_SEARCH", "value": "true", "is_encrypted": False}])
+
+        mock_table.select.return_value.eq.return_value.aexecute.side_effect = slow_query
+        credential_service._cache_initialized = True
+        credential_service._rag_settings_cache = None
+        credential_service._rag_settings_refresh = None
+
+        try:
+            with patch.object(credential_service, "_get_supabase_client", return_value=mock_client):
+                results = await asyncio.gather(
+                    *(credential_service.get_credentials_by_category("rag_strategy") for _ in range(5))
+                )
+                cached = await credential_service.get_credentials_by_category("rag_strategy")
+        finally:
+            credential_service._rag_settings_cache = None
+            credential_service._rag_cache_timestamp = None
+
+        assert queries == 1
+        assert all(result == {"USE_HYBRID_SEARCH": "true"} for result in results)
+        assert cached == {"USE_HYBRID_SEARCH": "true"}
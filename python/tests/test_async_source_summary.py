@@ -14,6 +14,16 @@ import pytest
 from src.server.services.crawling.document_storage_operations import DocumentStorageOperations
 
 
+def _mock_sources_exist(mock_supabase):
+    """Make the batched source verification query find every requested source_id."""
+    def select_in(column, values):
+        query = Mock()
+        query.execute.return_value = Mock(data=[{column: value} for value in values])
+        return query
+
+    mock_supabase.table.return_value.select.return_value.in_.side_effect = select_in
+
+
 class TestAsyncSourceSummary:
     """Test that extract_source_summary and update_source_info don't block the async event loop."""
 
@@ -23,6 +33,7 @@ class TestAsyncSourceSummary:
         # Create mock supabase client
         mock_supabase = Mock()
         mock_supabase.table.return_value.upsert.return_value.execute.return_value = Mock()
+        _mock_sources_exist(mock_supabase)
         
         doc_storage = DocumentStorageOperations(mock_supabase)
         
@@ -88,6 +99,7 @@ class TestAsyncSourceSummary:
         """Test that errors in extract_source_summary are handled correctly."""
         mock_supabase = Mock()
         mock_supabase.table.return_value.upsert.return_value.execute.return_value = Mock()
+        _mock_sources_exist(mock_supabase)
         
         doc_storage = DocumentStorageOperations(mock_supabase)
         
@@ -137,6 +149,7 @@ class TestAsyncSourceSummary:
         """Test that multiple source summaries are generated concurrently."""
         mock_supabase = Mock()
         mock_supabase.table.return_value.upsert.return_value.execute.return_value = Mock()
+        _mock_sources_exist(mock_supabase)
         
         doc_storage = DocumentStorageOperations(mock_supabase)
         
@@ -197,6 +210,7 @@ class TestAsyncSourceSummary:
         """Test that variables are properly passed to thread execution."""
         mock_supabase = Mock()
         mock_supabase.table.return_value.upsert.return_value.execute.return_value = Mock()
+        _mock_sources_exist(mock_supabase)
         
         doc_storage = DocumentStorageOperations(mock_supabase)
         
@@ -253,6 +267,7 @@ class TestAsyncSourceSummary:
         """Test that update_source_info is executed in a thread pool."""
         mock_supabase = Mock()
         mock_supabase.table.return_value.upsert.return_value.execute.return_value = Mock()
+        _mock_sources_exist(mock_supabase)
         
         doc_storage = DocumentStorageOperations(mock_supabase)
         
@@ -307,6 +322,7 @@ class TestAsyncSourceSummary:
         """Test that errors in update_source_info trigger fallback correctly."""
         mock_supabase = Mock()
         mock_supabase.table.return_value.upsert.return_value.execute.return_value = Mock()
+        _mock_sources_exist(mock_supabase)
         
         doc_storage = DocumentStorageOperations(mock_supabase)
         
@@ -362,6 +378,7 @@ class TestAsyncSourceSummary:
         """Test that all kwargs are properly passed to update_source_info in thread."""
         mock_supabase = Mock()
         mock_supabase.table.return_value.upsert.return_value.execute.return_value = Mock()
+        _mock_sources_exist(mock_supabase)
         
         doc_storage = DocumentStorageOperations(mock_supabase)
         
@@ -410,4 +427,64 @@ class TestAsyncSourceSummary:
                     assert captured_kwargs["update_frequency"] == 0
                     assert captured_kwargs["original_url"] == "https://original.url/crawl"
                     assert captured_kwargs["source_url"] == "https://source.url"
-                    assert captured_kwargs["source_display_name"] == "Source Display Name"
\ No newline at end of file
+                    assert captured_kwargs["source_display_name"] == "Source Display Name"
+
+    @pytest.mark.asyncio
+    async def test_source_verification_is_one_query(self):
+        """Test that all source_ids are verified with a single in_ query and missing ones fail."""
+        mock_supabase = Mock()
+        select = mock_supabase.table.return_value.select.return_value
+        select.in_.return_value.execute.return_value = Mock(data=[{"source_id": "found"}])
+
+        doc_storage = DocumentStorageOperations(mock_supabase)
+
+        with patch('src.server.services.crawling.document_storage_operations.extract_source_summary',
+                   AsyncMock(return_value="Summary")):
+            with patch('src.server.services.crawling.document_storage_operations.update_source_info',
+                       AsyncMock()):
+                with pytest.raises(Exception, match="missing"):
+                    await doc_storage._create_source_records(
+                        [{"source_id": "found", "word_count": 1}, {"source_id": "missing", "word_count": 1}],
+                        ["chunk a", "chunk b"],
+                        {},
+                        {"knowledge_type": "documentation"},
+                    )
+
+        select.in_.assert_called_once()
+        column, values = select.in_.call_args.args
+        assert column == "source_id"
+        assert sorted(values) == ["found", "missing"]
+
+    @pytest.mark.asyncio
+    async def test_summaries_for_multiple_sources_overlap(self):
+        """Test that summary requests for different sources are in flight at the same time."""
+        mock_supabase = Mock()
+        _mock_sources_exist(mock_supabase)
+
+        doc_storage = DocumentStorageOperations(mock_supabase)
+
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_summary(source_id, content):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return f"Summary for {source_id}"
+
+        with patch('src.server.services.crawling.document_storage_operations.extract_source_summary',
+                   side_effect=slow_summary):
+            with patch('src.server.services.crawling.document_storage_operations.update_source_info',
+                       AsyncMock()) as mock_update:
+                await doc_storage._create_source_records(
+                    [{"source_id": f"source{i}", "word_count": 10} for i in range(3)],
+                    ["chunk1", "chunk2", "chunk3"],
+                    {},
+                    {},
+                )
+
+        assert max_in_flight == 3
+        summaries = {call.kwargs["source_id"]: call.kwargs["summary"] for call in mock_update.call_args_list}
+        assert summaries == {f"source{i}": f"Summary for source{i}" for i in range(3)}
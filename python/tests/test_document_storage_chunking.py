@@ -0,0 +1,235 @@
+"""
+Test per-document chunking in process_and_store_documents.
+
+Every chunk must carry its own document's URL and per-document chunk numbering.
+Repeated URLs are chunked once.
+"""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.server.services.crawling.document_storage_operations import DocumentStorageOperations
+
+
+@pytest.mark.asyncio
+async def test_chunking_keeps_per_document_numbering():
+    doc_storage = DocumentStorageOperations(Mock())
+    doc_storage.doc_storage_service.iter_smart_chunks = Mock(
+        side_effect=lambda text, chunk_size: (f"{text}-{i}" for i in range(3))
+    )
+
+    async def mock_create_source_records(*args, **kwargs):
+        return None
+
+    doc_storage._create_source_records = mock_create_source_records
+
+    crawl_results = [
+        {"url": f"https://example.com/page{i}", "markdown": f"page{i}", "title": f"Page {i}"} for i in range(7)
+    ]
+
+    stored: dict[str, list] = {"urls": [], "chunk_numbers": [], "contents": [], "metadatas": []}
+
+    async def mock_add_documents(**kwargs):
+        for key, values in stored.items():
+            values.extend(kwargs[key])
+        return {"chunks_stored": len(kwargs["contents"])}
+
+    with patch(
+        "src.server.services.crawling.document_storage_operations.add_documents_to_supabase",
+        side_effect=mock_add_documents,
+    ):
+        result = await doc_storage.process_and_store_documents(
+            crawl_results=crawl_results,
+            request={"knowledge_type": "documentation", "tags": []},
+            crawl_type="normal",
+            original_source_id="src123",
+            progress_callback=None,
+            cancellation_check=None,
+            source_url="https://example.com",
+            source_display_name="Example",
+        )
+
+    assert result["chunk_count"] == 21
+    assert result["chunks_stored"] == 21
+    by_url: dict[str, list[int]] = {}
+    for url, number, content, metadata in zip(
+        stored["urls"], stored["chunk_numbers"], stored["contents"], stored["metadatas"], strict=True
+    ):
+        assert metadata["url"] == url
+        assert metadata["chunk_index"] == number
+        assert content == f"page{url[-1]}-{number}"
+        by_url.setdefault(url, []).append(number)
+
+    assert sorted(by_url) == sorted(doc["url"] for doc in crawl_results)
+    assert all(numbers == [0, 1, 2] for numbers in by_url.values())
+
+
+@pytest.mark.asyncio
+async def test_duplicate_urls_are_chunked_once_with_longest_body():
+    doc_storage = DocumentStorageOperations(Mock())
+    doc_storage.doc_storage_service.iter_smart_chunks = Mock(side_effect=lambda text, chunk_size: iter([text]))
+
+    captured = {}
+
+    async def mock_create_source_records(all_metadatas, all_contents, source_word_counts, *args):
+        captured["contents"] = list(all_contents)
+        captured["word_counts"] = dict(source_word_counts)
+
+    doc_storage._create_source_records = mock_create_source_records
+
+    stored_contents: list[str] = []
+
+    async def mock_add_documents(**kwargs):
+        stored_contents.extend(kwargs["contents"])
+        return {"chunks_stored": len(kwargs["contents"])}
+
+    crawl_results = [
+        {"url": "https://example.com/a", "markdown": "short body"},
+        {"url": "https://example.com/b", "markdown": "other page"},
+        {"url": "https://example.com/a ", "markdown": "a much longer body"},
+    ]
+
+    with patch(
+        "src.server.services.crawling.document_storage_operations.add_documents_to_supabase",
+        side_effect=mock_add_documents,
+    ):
+        result = await doc_storage.process_and_store_documents(
+            crawl_results=crawl_results,
+            request={},
+            crawl_type="normal",
+            original_source_id="src123",
+        )
+
+    assert sorted(stored_contents) == ["a much longer body", "other page"]
+    assert result["chunk_count"] == 2
+    assert sorted(result["url_to_full_document"]) == ["https://example.com/a", "https://example.com/b"]
+    assert captured["contents"] == ["a much longer body", "other page"]
+    assert captured["word_counts"] == {"src123": 6}
+
+
+@pytest.mark.asyncio
+async def test_cancellation_is_checked_every_tenth_chunk():
+    doc_storage = DocumentStorageOperations(Mock())
+    doc_storage.doc_storage_service.iter_smart_chunks = Mock(
+        side_effect=lambda text, chunk_size: (f"chunk {i}" for i in range(25))
+    )
+
+    async def mock_create_source_records(*args, **kwargs):
+        return None
+
+    doc_storage._create_source_records = mock_create_source_records
+
+    cancellation_check = Mock()
+
+    with patch(
+        "src.server.services.crawling.document_storage_operations.add_documents_to_supabase",
+        return_value={"chunks_stored": 25},
+    ):
+        result = await doc_storage.process_and_store_documents(
+            crawl_results=[{"url": "https://example.com/a", "markdown": "body"}],
+            request={},
+            crawl_type="normal",
+            original_source_id="src123",
+            cancellation_check=cancellation_check,
+        )
+
+    assert result["chunk_count"] == 25
+    # Once while preparing, once before chunking the document, then at chunks 0, 10 and 20
+    assert cancellation_check.call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_llms_full_sections_are_flushed_incrementally():
+    doc_storage = DocumentStorageOperations(Mock())
+    doc_storage.doc_storage_service.iter_smart_chunks = Mock(
+        side_effect=lambda text, chunk_size: (f"chunk {i}" for i in range(20))
+    )
+
+    async def mock_create_source_records(*args, **kwargs):
+        return None
+
+    doc_storage._create_source_records = mock_create_source_records
+
+    flushes = []
+
+    async def mock_add_documents(**kwargs):
+        flushes.append(
+            {
+                "count": len(kwargs["contents"]),
+                "delete": kwargs["delete_existing_records"],
+                "deletion_urls": kwargs["deletion_urls"],
+            }
+        )
+        return {"chunks_stored": len(kwargs["contents"])}
+
+    content = "# Core Concepts\n\n" + "Intro text. " * 50 + "\n\n# Getting Started\n\n" + "Setup text. " * 50
+
+    with (
+        patch(
+            "src.server.services.crawling.document_storage_operations.add_documents_to_supabase",
+            side_effect=mock_add_documents,
+        ),
+        patch(
+            "src.server.services.crawling.document_storage_operations.credential_service.get_credentials_by_category",
+            AsyncMock(return_value={"DOCUMENT_STORAGE_FLUSH_CHUNKS": "25"}),
+        ),
+        patch(
+            "src.server.services.crawling.page_storage_operations.PageStorageOperations.store_llms_full_sections",
+            AsyncMock(return_value={}),
+        ),
+    ):
+        result = await doc_storage.process_and_store_documents(
+            crawl_results=[{"url": "https://example.com/llms-full.txt", "markdown": content}],
+            request={},
+            crawl_type="llms-txt",
+            original_source_id="src123",
+        )
+
+    assert result["chunk_count"] == 40
+    assert result["chunks_stored"] == 40
+    assert [flush["count"] for flush in flushes] == [25, 15]
+    # Existing rows for every section are deleted once, by the first flush
+    assert flushes[0]["delete"] is True
+    assert len(flushes[0]["deletion_urls"]) == 2
+    assert flushes[1]["delete"] is False
+
+
+@pytest.mark.asyncio
+async def test_large_document_is_flushed_mid_document():
+    doc_storage = DocumentStorageOperations(Mock())
+    doc_storage.doc_storage_service.iter_smart_chunks = Mock(
+        side_effect=lambda text, chunk_size: (f"chunk {i}" for i in range(60))
+    )
+
+    async def mock_create_source_records(*args, **kwargs):
+        return None
+
+    doc_storage._create_source_records = mock_create_source_records
+
+    flushes = []
+
+    async def mock_add_documents(**kwargs):
+        flushes.append(list(kwargs["chunk_numbers"]))
+        return {"chunks_stored": len(kwargs["contents"])}
+
+    with (
+        patch(
+            "src.server.services.crawling.document_storage_operations.add_documents_to_supabase",
+            side_effect=mock_add_documents,
+        ),
+        patch(
+            "src.server.services.crawling.document_storage_operations.credential_service.get_credentials_by_category",
+            AsyncMock(return_value={"DOCUMENT_STORAGE_FLUSH_CHUNKS": "25"}),
+        ),
+    ):
+        result = await doc_storage.process_and_store_documents(
+            crawl_results=[{"url": "https://example.com/manual.pdf", "markdown": "body"}],
+            request={},
+            crawl_type="normal",
+            original_source_id="src123",
+        )
+
+    assert result["chunk_count"] == 60
+    assert [len(numbers) for numbers in flushes] == [25, 25, 10]
+    assert [n for numbers in flushes for n in numbers] == list(range(60))
@@ -0,0 +1,25 @@
+"""
+Test word counting used for source and chunk metadata.
+
+Windowed counting of large documents must match len(text.split()).
+"""
+
+from src.server.services.crawling import document_storage_operations
+from src.server.services.crawling.document_storage_operations import _count_words
+
+
+class TestCountWords:
+    """Test _count_words against str.split semantics."""
+
+    def test_small_text_matches_split(self):
+        text = "  Hello\tworld\n\n  from   Archon  "
+        assert _count_words(text) == len(text.split()) == 4
+
+    def test_windowed_count_matches_split(self, monkeypatch):
+        monkeypatch.setattr(document_storage_operations, "_WORD_COUNT_WINDOW", 8)
+        text = "alpha beta\n\ngamma-delta   epsilon\tzeta " + "x" * 30 + " eta"
+        assert _count_words(text) == len(text.split())
+
+    def test_empty_and_whitespace_only(self):
+        assert _count_words("") == 0
+        assert _count_words(" \n\t ") == 0
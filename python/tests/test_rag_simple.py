@@ -6,10 +6,12 @@ These tests verify the core RAG functionality without heavy dependencies.
 """
 
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from src.server.db.protocol import APIResponse
+
 # Set test environment variables
 os.environ.update({
     "SUPABASE_URL": "http://test.supabase.co",
@@ -25,7 +27,7 @@ os.environ.update({
 def mock_supabase():
     """Mock supabase client"""
     client = MagicMock()
-    client.rpc.return_value.execute.return_value.data = []
+    client.rpc.return_value.aexecute = AsyncMock(return_value=APIResponse(data=[]))
     client.from_.return_value.select.return_value.limit.return_value.execute.return_value.data = []
     return client
 
@@ -69,17 +71,18 @@ class TestRAGServiceSearch:
     async def test_basic_vector_search(self, rag_service, mock_supabase):
         """Test basic vector search functionality"""
         # Mock the RPC response
-        mock_response = MagicMock()
-        mock_response.data = [
-            {
-                "id": "1",
-                "content": "Test content",
-                "similarity": 0.8,
-                "metadata": {},
-                "url": "test.com",
-            }
-        ]
-        mock_supabase.rpc.return_value.execute.return_value = mock_response
+        mock_response = APIResponse(
+            data=[
+                {
+                    "id": "1",
+                    "content": "Test content",
+                    "similarity": 0.8,
+                    "metadata": {},
+                    "url": "test.com",
+                }
+            ]
+        )
+        mock_supabase.rpc.return_value.aexecute.return_value = mock_response
 
         # Test the search
         query_embedding = [0.1] * 1536
@@ -0,0 +1,63 @@
+"""
+Test boundary selection in BaseStorageService.smart_chunk_text.
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.server.services.storage.storage_services import DocumentStorageService
+
+
+@pytest.fixture
+def service():
+    return DocumentStorageService(Mock())
+
+
+class TestSmartChunkText:
+    """Test separator priority and the 30% minimum break position."""
+
+    def test_prefers_code_block_boundary(self, service):
+        text = "a" * 400 + "\n\n" + "b" * 200 + "```" + "c" * 1000
+        chunks = service.smart_chunk_text(text, chunk_size=1000)
+        assert chunks[0] == "a" * 400 + "\n\n" + "b" * 200
+        assert chunks[1].startswith("```")
+
+    def test_paragraph_break_before_sentence_break(self, service):
+        text = "a" * 400 + "\n\n" + "b" * 300 + ". " + "c" * 1000
+        chunks = service.smart_chunk_text(text, chunk_size=1000)
+        assert chunks[0] == "a" * 400
+
+    def test_sentence_break_keeps_period(self, service):
+        text = "a" * 600 + ". " + "b" * 3000
+        chunks = service.smart_chunk_text(text, chunk_size=1000)
+        assert chunks[0] == "a" * 600 + "."
+
+    def test_break_too_early_in_window_is_ignored(self, service):
+        text = "a" * 10 + "\n\n" + "b" * 300
+        chunks = service.smart_chunk_text(text, chunk_size=250)
+        assert len(chunks[0]) == 250
+
+    def test_small_chunks_are_combined(self, service):
+        text = "a" * 50 + "\n\n" + "b" * 50 + "\n\n" + "c" * 50
+        assert service.smart_chunk_text(text, chunk_size=60) == ["a" * 50 + "\n\n" + "b" * 50 + "\n\n" + "c" * 50]
+
+    def test_text_within_chunk_size_is_one_stripped_chunk(self, service):
+        assert service.smart_chunk_text("  short. text\n\n", chunk_size=16) == ["short. text"]
+        assert service.smart_chunk_text(" \n\t ", chunk_size=16) == []
+
+    async def test_async_iterator_matches_list(self, service):
+        text = ("Sentence one. Sentence two.\n\n" * 400) + "```python\nprint('x')\n```\n" * 50
+        streamed = [chunk async for chunk in service.smart_chunk_text_iter_async(text, chunk_size=500)]
+        assert streamed == service.smart_chunk_text(text, chunk_size=500)
+        assert len(streamed) > 16
+
+    async def test_texts_are_chunked_with_one_pool_submission(self, service):
+        texts = ["Sentence one. Sentence two.\n\n" * 2000, "", "short text"]
+        service.threading_service = Mock()
+        service.threading_service.run_cpu_intensive = AsyncMock(side_effect=lambda func, *args: func(*args))
+
+        chunked = await service.smart_chunk_texts_async(texts, chunk_size=500)
+
+        assert chunked == [service.smart_chunk_text(text, chunk_size=500) for text in texts]
+        service.threading_service.run_cpu_intensive.assert_awaited_once()
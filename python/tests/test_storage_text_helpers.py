@@ -0,0 +1,175 @@
+"""
+Test BaseStorageService helpers: metadata extraction, batch splitting and batch processing.
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from src.server.services.storage.storage_services import DocumentStorageService
+
+
+@pytest.fixture
+def service():
+    return DocumentStorageService(Mock())
+
+
+class TestExtractMetadata:
+    """Test per-chunk metadata extraction."""
+
+    def test_headers_and_stats(self, service):
+        chunk = "# Title\nSome text with http://example.com\n## Section two\n```py\ncode\n```"
+        metadata = service.extract_metadata(chunk, {"chunk_index": 3})
+
+        assert metadata["headers"] == "# Title; ## Section two"
+        assert metadata["char_count"] == len(chunk)
+        assert metadata["word_count"] == len(chunk.split())
+        assert metadata["line_count"] == 6
+        assert metadata["has_code"] is True
+        assert metadata["has_links"] is True
+        assert metadata["chunk_index"] == 3
+
+    def test_no_headers(self, service):
+        metadata = service.extract_metadata("plain text, #not a header")
+        assert metadata["headers"] == ""
+        assert metadata["has_code"] is False
+        assert metadata["has_links"] is False
+
+    def test_headers_are_capped(self, service):
+        chunk = "\n".join(f"## Header {n}" for n in range(40))
+        metadata = service.extract_metadata(chunk)
+
+        assert metadata["headers"] == "; ".join(f"## Header {n}" for n in range(32))
+
+
+class TestSplitTextForIncrementalChunking:
+    """Test batching of large texts before chunking."""
+
+    def test_batches_by_pdf_page_markers(self, service):
+        text = "".join(f"--- Page {n} ---\nPage {n} body\n" for n in range(1, 6))
+        batches = service.split_text_for_incremental_chunking(text, pdf_pages_per_batch=2)
+
+        assert len(batches) == 3
+        assert batches[0] == "--- Page 1 ---\nPage 1 body\n\n--- Page 2 ---\nPage 2 body"
+        assert batches[2] == "--- Page 5 ---\nPage 5 body"
+
+    def test_batches_by_characters_at_paragraph_breaks(self, service):
+        text = "a" * 8_000 + "\n\n" + "b" * 8_000
+        batches = service.split_text_for_incremental_chunking(text, max_chars_per_batch=10_000)
+
+        assert batches == ["a" * 8_000, "b" * 8_000]
+
+    def test_sections_are_stripped_like_str_strip(self, service):
+        text = "--- Page 1 ---\nbody one \t\r\n\u3000\n--- Page 2 ---\n \n--- Page 3 ---\nbody three\n"
+        batches = service.split_text_for_incremental_chunking(text, pdf_pages_per_batch=1)
+
+        assert batches == ["--- Page 1 ---\nbody one", "--- Page 2 ---", "--- Page 3 ---\nbody three"]
+
+
+class TestExtractSourceId:
+    """Test source ID extraction from URLs."""
+
+    def test_uses_host(self, service):
+        assert service.extract_source_id("https://docs.example.com/guide/intro") == "docs.example.com"
+        assert service.extract_source_id("https://docs.example.com/guide/other") == "docs.example.com"
+
+    def test_falls_back_to_path(self, service):
+        assert service.extract_source_id("file.txt") == "file.txt"
+
+    def test_host_boundaries_match_urlparse(self, service):
+        assert service.extract_source_id("https://user@example.com:8443?page=2") == "user@example.com:8443"
+        assert service.extract_source_id("http://example.com#intro") == "example.com"
+        assert service.extract_source_id("http://[::1]:8080/docs") == "[::1]:8080"
+        assert service.extract_source_id("https://[::1/docs") == "https://[::1/docs"
+
+
+class TestBatchProcessWithProgress:
+    """Test concurrent batch processing."""
+
+    async def test_batches_overlap_and_results_keep_order(self, service):
+        in_flight = 0
+        peak = 0
+
+        async def process(batch):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Earlier batches finish last
+            await asyncio.sleep(0.01 * (10 - batch[0]))
+            in_flight -= 1
+            return [item * 2 for item in batch]
+
+        results = await service.batch_process_with_progress(
+            list(range(10)), process, batch_size=3, concurrency=2
+        )
+
+        assert results == [item * 2 for item in range(10)]
+        assert peak == 2
+
+    async def test_batches_run_one_at_a_time_by_default(self, service):
+        in_flight = 0
+        peak = 0
+
+        async def process(batch):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return batch
+
+        results = await service.batch_process_with_progress(list(range(6)), process, batch_size=2)
+
+        assert results == list(range(6))
+        assert peak == 1
+
+    async def test_progress_counts_completed_items(self, service):
+        progress = []
+
+        async def process(batch):
+            return batch
+
+        async def on_progress(message, pct):
+            progress.append((message, pct))
+
+        await service.batch_process_with_progress(
+            list(range(5)), process, batch_size=2, progress_callback=on_progress, description="Embedding"
+        )
+
+        assert [pct for _, pct in progress] == [40, 80, 100]
+        assert progress[-1][0] == "Embedding: 5/5 items"
+
+    async def test_slow_progress_callback_does_not_block_batches(self, service):
+        progress = []
+        processed = []
+
+        async def process(batch):
+            processed.extend(batch)
+            return batch
+
+        async def slow_progress(message, pct):
+            await asyncio.sleep(0.01)
+            progress.append((pct, len(processed)))
+
+        results = await service.batch_process_with_progress(
+            list(range(20)), process, batch_size=1, progress_callback=slow_progress, concurrency=20
+        )
+
+        assert results == list(range(20))
+        # Every batch finished before the first update was delivered; stale updates were dropped
+        assert progress[0][1] == 20
+        assert len(progress) < 20
+        assert progress[-1][0] == 100
+
+    async def test_progress_callback_errors_propagate(self, service):
+        async def process(batch):
+            return batch
+
+        async def failing_progress(message, pct):
+            raise RuntimeError("progress sink closed")
+
+        with pytest.raises(RuntimeError, match="progress sink closed"):
+            await service.batch_process_with_progress(
+                list(range(4)), process, batch_size=2, progress_callback=failing_progress
+            )